@@ -0,0 +1,288 @@
+"""
+benchmarks of the flask-sugar request pipeline and openapi generation
+
+usage:
+    python benchmarks/run.py                      # run all, write benchmark.json
+    python benchmarks/run.py -k query -o a.json   # run the benchmarks whose name contains "query"
+    python benchmarks/run.py --compare a.json     # print the ratio to a previous result
+"""
+
+import argparse
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import flask  # noqa: E402
+import pydantic  # noqa: E402
+from pydantic import BaseModel, create_model  # noqa: E402
+
+import flask_sugar  # noqa: E402
+from flask_sugar import Body, Cookie, File, Form, Header, Sugar, UploadFile  # noqa: E402
+from flask_sugar.openapi import collect_paths_components  # noqa: E402
+
+Benchmark = Callable[[], Tuple[Callable[[], Any], int]]
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str) -> Callable[[Benchmark], Benchmark]:
+    """register a setup function, which returns the function to time and the status it expects"""
+
+    def decorator(setup: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return decorator
+
+
+def make_view(app: Sugar, rule: str, params: Dict[str, Any], **options: Any) -> None:
+    """register a view whose signature is built from params: {name: (annotation, default)}"""
+    args = ", ".join(
+        f"{name}: {annotation}{default}" for name, (annotation, default) in params.items()
+    )
+    namespace: Dict[str, Any] = {
+        "Header": Header,
+        "Cookie": Cookie,
+        "Body": Body,
+        "Form": Form,
+        "File": File,
+        "UploadFile": UploadFile,
+        **options.pop("namespace", {}),
+    }
+    exec(f"def view({args}):\n    return {{'ok': True}}", namespace)
+    view = namespace["view"]
+    view.__name__ = rule.strip("/").replace("/", "_") or "index"
+    app.add_url_rule(rule, view_func=view, methods=options.pop("methods", ["GET"]), **options)
+
+
+for count in (1, 10, 50):
+
+    @benchmark(f"view_query_params_{count}")
+    def query_params(count: int = count) -> Tuple[Callable[[], Any], int]:
+        app = Sugar(__name__, enable_doc=False)
+        make_view(app, "/query", {f"q{i}": ("int", " = 0") for i in range(count)})
+        client = app.test_client()
+        url = "/query?" + "&".join(f"q{i}={i}" for i in range(count))
+        return lambda: client.get(url), 200
+
+    @benchmark(f"view_header_params_{count}")
+    def header_params(count: int = count) -> Tuple[Callable[[], Any], int]:
+        app = Sugar(__name__, enable_doc=False)
+        make_view(app, "/headers", {f"h{i}": ("int", " = Header(0)") for i in range(count)})
+        client = app.test_client()
+        headers = {f"h{i}": str(i) for i in range(count)}
+        return lambda: client.get("/headers", headers=headers), 200
+
+    @benchmark(f"view_cookie_params_{count}")
+    def cookie_params(count: int = count) -> Tuple[Callable[[], Any], int]:
+        app = Sugar(__name__, enable_doc=False)
+        make_view(app, "/cookies", {f"c{i}": ("int", " = Cookie(0)") for i in range(count)})
+        client = app.test_client()
+        for i in range(count):
+            client.set_cookie("localhost", f"c{i}", str(i))
+        return lambda: client.get("/cookies"), 200
+
+
+def make_item_model(fields: int) -> type:
+    return create_model(  # type: ignore
+        f"Item{fields}", **{f"f{i}": (int, ...) for i in range(fields)}
+    )
+
+
+for fields in (5, 50):
+
+    @benchmark(f"view_json_body_{fields}_fields")
+    def json_body(fields: int = fields) -> Tuple[Callable[[], Any], int]:
+        app = Sugar(__name__, enable_doc=False)
+        Item = make_item_model(fields)
+        make_view(app, "/json", {"item": ("Item", "")}, methods=["POST"], namespace={"Item": Item})
+        client = app.test_client()
+        data = {f"f{i}": i for i in range(fields)}
+        return lambda: client.post("/json", json=data), 200
+
+    @benchmark(f"view_form_body_{fields}_fields")
+    def form_body(fields: int = fields) -> Tuple[Callable[[], Any], int]:
+        app = Sugar(__name__, enable_doc=False)
+        Item = make_item_model(fields)
+        make_view(
+            app,
+            "/form",
+            {"item": ("Item", " = Form(...)")},
+            methods=["POST"],
+            namespace={"Item": Item},
+        )
+        client = app.test_client()
+        data = {f"f{i}": str(i) for i in range(fields)}
+        return lambda: client.post("/form", data=data), 200
+
+
+for size in (1024, 1024 * 1024):
+
+    @benchmark(f"view_file_upload_{size // 1024}kb")
+    def file_upload(size: int = size) -> Tuple[Callable[[], Any], int]:
+        app = Sugar(__name__, enable_doc=False)
+        make_view(app, "/upload", {"file": ("UploadFile", " = File(...)")}, methods=["POST"])
+        client = app.test_client()
+        content = b"x" * size
+        return (
+            lambda: client.post("/upload", data={"file": (io.BytesIO(content), "file.bin")}),
+            200,
+        )
+
+
+class Small(BaseModel):
+    id: int
+    name: str
+    price: float
+
+
+class Row(BaseModel):
+    id: int
+    name: str
+    tags: List[str]
+
+
+class Large(BaseModel):
+    rows: List[Row]
+
+
+@benchmark("view_response_model_small")
+def response_model_small() -> Tuple[Callable[[], Any], int]:
+    app = Sugar(__name__, enable_doc=False)
+
+    @app.get("/small", response_model=Small)
+    def small() -> Dict[str, Any]:
+        return {"id": 1, "name": "item", "price": 1.5}
+
+    client = app.test_client()
+    return lambda: client.get("/small"), 200
+
+
+@benchmark("view_response_model_large")
+def response_model_large() -> Tuple[Callable[[], Any], int]:
+    app = Sugar(__name__, enable_doc=False)
+    rows = [{"id": i, "name": f"row {i}", "tags": ["a", "b"]} for i in range(1000)]
+
+    @app.get("/large", response_model=Large)
+    def large() -> Dict[str, Any]:
+        return {"rows": rows}
+
+    client = app.test_client()
+    return lambda: client.get("/large"), 200
+
+
+def make_app(routes: int) -> Sugar:
+    app = Sugar(__name__)
+    for i in range(routes):
+        Item = create_model(f"Item{i}", id=(int, ...), name=(str, ...))  # type: ignore
+        make_view(
+            app,
+            f"/items{i}/<int:item_id>",
+            {"item_id": ("int", ""), "item": ("Item", ""), "q": ("str", " = None")},
+            methods=["PUT"],
+            namespace={"Item": Item},
+            response_model=Item,
+        )
+    return app
+
+
+for routes in (10, 100, 1000):
+
+    @benchmark(f"openapi_collect_paths_components_{routes}_routes")
+    def openapi(routes: int = routes) -> Tuple[Callable[[], Any], int]:
+        app = make_app(routes)
+        return lambda: collect_paths_components(app), 0
+
+    @benchmark(f"register_{routes}_routes")
+    def register(routes: int = routes) -> Tuple[Callable[[], Any], int]:
+        return lambda: make_app(routes), 0
+
+
+@benchmark("import_flask_sugar")
+def import_time() -> Tuple[Callable[[], Any], int]:
+    """a fresh interpreter importing flask_sugar, includes the interpreter startup"""
+    command = [sys.executable, "-c", "import flask_sugar"]
+    return lambda: subprocess.run(command, cwd=ROOT, check=True), 0
+
+
+def measure(func: Callable[[], Any], repeat: int, min_time: float) -> Dict[str, Any]:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("-o", "--output", default="benchmark.json", help="json result file")
+    parser.add_argument("-k", "--filter", default="", help="only run benchmarks containing it")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="timing repeats")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per repeat")
+    parser.add_argument("--compare", help="previous json result to compare with")
+    args = parser.parse_args(argv)
+
+    previous = {}
+    if args.compare:
+        previous = json.loads(Path(args.compare).read_text())["benchmarks"]
+
+    results: Dict[str, Any] = {}
+    for name, setup in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+        func, status = setup()
+        response = func()
+        if status:
+            assert response.status_code == status, f"{name}: {response.status_code}"
+        result = results[name] = measure(func, args.repeat, args.min_time)
+        line = f"{name:<48} {result['min'] * 1e6:>12.1f} us"
+        if name in previous:
+            line += f"  x{result['min'] / previous[name]['min']:.2f}"
+        print(line, flush=True)
+
+    output = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "flask": flask.__version__,
+            "pydantic": pydantic.VERSION,
+            "flask_sugar": flask_sugar.__version__,
+        },
+        "benchmarks": results,
+    }
+    Path(args.output).write_text(json.dumps(output, indent=2))
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
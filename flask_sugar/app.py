@@ -1,4 +1,6 @@
-from functools import lru_cache
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Type, Union
 
 from flask import Flask
@@ -6,17 +8,31 @@ from pydantic import BaseModel
 from werkzeug.routing import Rule
 
 from flask_sugar.blueprints import Blueprint
+from flask_sugar.cache import ResponseCache
+from flask_sugar.cli import sugar_cli
+from flask_sugar.converters import compile_rule
 from flask_sugar.errorhandlers import validation_error_handler
 from flask_sugar.exceptions import RequestValidationError
-from flask_sugar.openapi import openapi_json_view, rapidoc, redoc, swagger
+from flask_sugar.instrumentation import Instrumentation, instrumentation_view
+from flask_sugar.openapi import OpenAPICache, openapi_json_view, rapidoc, redoc, swagger
+from flask_sugar.pool import ValidationPool
+from flask_sugar.serializers import JSONSerializer
 from flask_sugar.utils import convert_path
-from flask_sugar.view import View
+from flask_sugar.view import ResponseValidation, View
 
 if TYPE_CHECKING:
     from pydantic.typing import AbstractSetIntStr, MappingIntStrAny
 
 
 class Sugar(Flask):
+    validation_executor: Optional[ThreadPoolExecutor] = None
+    validation_pool: Optional[ValidationPool] = None
+    json_serializer: Optional[JSONSerializer] = None
+    response_validation: ResponseValidation = "full"
+    response_validation_sample: Optional[int] = None
+    lazy_views: bool = False
+    instrumentation: Optional[Instrumentation] = None
+
     def __init__(
         self,
         import_name: str,
@@ -51,7 +67,17 @@ class Sugar(Flask):
         rapidoc_js_url: str = "https://cdn.jsdelivr.net/npm/rapidoc@9.1.4/dist/rapidoc-min.min.js",
         default_validation_errorhandler: Optional[Callable[..., Any]] = None,
         doc_route_filter: Optional[Callable[[View, Rule], bool]] = None,
+        async_validation_workers: Optional[int] = None,
+        validation_processes: Optional[int] = None,
+        json_serializer: Optional[JSONSerializer] = None,
+        response_validation: ResponseValidation = "full",
+        response_validation_sample: Optional[int] = None,
+        openapi_static_path: Optional[str] = None,
+        lazy_views: bool = False,
+        instrumentation: Optional[Instrumentation] = None,
+        instrumentation_url: Optional[str] = None,
     ):
+        self.openapi_cache = OpenAPICache()
         super().__init__(
             import_name=import_name,
             static_url_path=static_url_path,
@@ -74,6 +100,7 @@ class Sugar(Flask):
         self.tags = tags
         self.security_schemes = security_schemes
         self.cache_openapi_json = cache_openapi_json
+        self.openapi_static_path = openapi_static_path
         self.openapi_url_prefix = openapi_url_prefix
         self.openapi_json_url = openapi_json_url
         self.swagger_url = swagger_url
@@ -85,14 +112,30 @@ class Sugar(Flask):
         self.redoc_js_url = redoc_js_url
         self.rapidoc_js_url = rapidoc_js_url
         self.doc_route_filter = doc_route_filter
+        self.json_serializer = json_serializer
+        self.response_validation = response_validation
+        self.response_validation_sample = response_validation_sample
+        self.lazy_views = lazy_views
+        self.instrumentation = instrumentation
+        if async_validation_workers:
+            self.validation_executor = ThreadPoolExecutor(
+                max_workers=async_validation_workers, thread_name_prefix="flask-sugar"
+            )
+            atexit.register(self.validation_executor.shutdown)
+        if validation_processes:
+            self.validation_pool = ValidationPool(max_workers=validation_processes)
+            atexit.register(self.validation_pool.shutdown)
         error_handler = (
             default_validation_errorhandler
             if default_validation_errorhandler is not None
             else validation_error_handler
         )
         self.register_error_handler(RequestValidationError, error_handler)
+        self.cli.add_command(sugar_cli)
         if enable_doc:
             self.init_doc()
+        if instrumentation and instrumentation_url:
+            self.add_url_rule(instrumentation_url, view_func=instrumentation_view, doc_enable=False)
 
     def add_url_rule(
         self,
@@ -118,12 +161,28 @@ class Sugar(Flask):
         response_model_exclude_unset: bool = False,
         response_model_exclude_defaults: bool = False,
         response_model_exclude_none: bool = False,
+        response_validation: Optional[ResponseValidation] = None,
+        response_validation_sample: Optional[int] = None,
+        batch: bool = False,
+        coalesce: bool = False,
+        cache: Optional[ResponseCache] = None,
+        etag: Union[bool, Callable[..., Optional[str]]] = False,
+        last_modified: Optional[Callable[..., Optional[datetime]]] = None,
+        validate_in_process_pool: Union[bool, int] = False,
         **options: Any,
     ) -> None:
         path = convert_path(rule)
         assert view_func, "view_func can't be None"
+        rule, path_params = compile_rule(rule, view_func, self.url_map.converters)
         if endpoint == "static":
             doc_enable = False
+        if coalesce or cache is not None:
+            methods = options.get("methods") or getattr(view_func, "methods", None) or ["GET"]
+            methods = {method.upper() for method in methods}
+            assert methods <= {
+                "GET",
+                "HEAD",
+            }, "only GET and HEAD view_func can be coalesced or cached"
         view = View(
             path=path,
             view_func=view_func,
@@ -146,19 +205,56 @@ class Sugar(Flask):
             response_model_exclude_unset=response_model_exclude_unset,
             response_model_exclude_defaults=response_model_exclude_defaults,
             response_model_exclude_none=response_model_exclude_none,
+            response_validation=response_validation or self.response_validation,
+            response_validation_sample=(
+                response_validation_sample
+                if response_validation_sample is not None
+                else self.response_validation_sample
+            ),
+            batch=batch,
+            coalesce=coalesce,
+            cache=cache,
+            etag=etag,
+            last_modified=last_modified,
+            validate_in_process_pool=validate_in_process_pool,
+            validation_executor=self.validation_executor,
+            validation_pool=self.validation_pool,
+            json_serializer=self.json_serializer,
+            instrumentation=self.instrumentation,
+            path_params=path_params,
+            lazy=self.lazy_views,
         )
         super().add_url_rule(rule, endpoint, view, provide_automatic_options, **options)
+        self.openapi_cache.invalidate(view.endpoint_name)
+
+    def invalidate_cache(self, endpoint: str, **values: Any) -> None:
+        """
+        drop the cached responses of endpoint, or only the one of the given parameters
+        """
+        view = self.view_functions[endpoint]
+        assert isinstance(view, View) and view.cache, f"endpoint {endpoint!r} has no cache"
+        view.cache.invalidate(view.endpoint_name, values or None)
+
+    def compile_views(self) -> None:
+        """
+        build the models of all lazy views now, e.g. before forking workers with gunicorn --preload
+        """
+        for view in self.view_functions.values():
+            if isinstance(view, View):
+                view.compile()
+
+    def build_openapi(self) -> Dict[str, Any]:
+        """
+        precompute the cached openapi document, call it once all blueprints are registered
+        """
+        self.openapi_cache.get_encoded_openapi_json(self)
+        return self.openapi_cache.get_openapi_json(self)
 
     def init_doc(self):
         openapi_bp = Blueprint("openapi", __name__, url_prefix=self.openapi_url_prefix)
         if self.openapi_json_url:
-            _openapi_json_view = (
-                lru_cache(maxsize=1)(openapi_json_view)
-                if self.cache_openapi_json
-                else openapi_json_view
-            )
             openapi_bp.add_url_rule(
-                self.openapi_json_url, view_func=_openapi_json_view, doc_enable=False
+                self.openapi_json_url, view_func=openapi_json_view, doc_enable=False
             )
 
         if self.openapi_json_url and self.swagger_url:
@@ -195,6 +291,14 @@ class Sugar(Flask):
         response_model_exclude_unset: bool = False,
         response_model_exclude_defaults: bool = False,
         response_model_exclude_none: bool = False,
+        response_validation: Optional[ResponseValidation] = None,
+        response_validation_sample: Optional[int] = None,
+        batch: bool = False,
+        coalesce: bool = False,
+        cache: Optional[ResponseCache] = None,
+        etag: Union[bool, Callable[..., Optional[str]]] = False,
+        last_modified: Optional[Callable[..., Optional[datetime]]] = None,
+        validate_in_process_pool: Union[bool, int] = False,
         **options: Any,
     ) -> Callable:
         return super().get(
@@ -219,6 +323,14 @@ class Sugar(Flask):
             response_model_exclude_unset=response_model_exclude_unset,
             response_model_exclude_defaults=response_model_exclude_defaults,
             response_model_exclude_none=response_model_exclude_none,
+            response_validation=response_validation,
+            response_validation_sample=response_validation_sample,
+            batch=batch,
+            coalesce=coalesce,
+            cache=cache,
+            etag=etag,
+            last_modified=last_modified,
+            validate_in_process_pool=validate_in_process_pool,
             **options,
         )
 
@@ -245,6 +357,12 @@ class Sugar(Flask):
         response_model_exclude_unset: bool = False,
         response_model_exclude_defaults: bool = False,
         response_model_exclude_none: bool = False,
+        response_validation: Optional[ResponseValidation] = None,
+        response_validation_sample: Optional[int] = None,
+        batch: bool = False,
+        etag: Union[bool, Callable[..., Optional[str]]] = False,
+        last_modified: Optional[Callable[..., Optional[datetime]]] = None,
+        validate_in_process_pool: Union[bool, int] = False,
         **options: Any,
     ) -> Callable:
         return super().post(
@@ -269,6 +387,12 @@ class Sugar(Flask):
             response_model_exclude_unset=response_model_exclude_unset,
             response_model_exclude_defaults=response_model_exclude_defaults,
             response_model_exclude_none=response_model_exclude_none,
+            response_validation=response_validation,
+            response_validation_sample=response_validation_sample,
+            batch=batch,
+            etag=etag,
+            last_modified=last_modified,
+            validate_in_process_pool=validate_in_process_pool,
             **options,
         )
 
@@ -295,6 +419,12 @@ class Sugar(Flask):
         response_model_exclude_unset: bool = False,
         response_model_exclude_defaults: bool = False,
         response_model_exclude_none: bool = False,
+        response_validation: Optional[ResponseValidation] = None,
+        response_validation_sample: Optional[int] = None,
+        batch: bool = False,
+        etag: Union[bool, Callable[..., Optional[str]]] = False,
+        last_modified: Optional[Callable[..., Optional[datetime]]] = None,
+        validate_in_process_pool: Union[bool, int] = False,
         **options: Any,
     ) -> Callable:
         return super().put(
@@ -319,6 +449,12 @@ class Sugar(Flask):
             response_model_exclude_unset=response_model_exclude_unset,
             response_model_exclude_defaults=response_model_exclude_defaults,
             response_model_exclude_none=response_model_exclude_none,
+            response_validation=response_validation,
+            response_validation_sample=response_validation_sample,
+            batch=batch,
+            etag=etag,
+            last_modified=last_modified,
+            validate_in_process_pool=validate_in_process_pool,
             **options,
         )
 
@@ -345,6 +481,12 @@ class Sugar(Flask):
         response_model_exclude_unset: bool = False,
         response_model_exclude_defaults: bool = False,
         response_model_exclude_none: bool = False,
+        response_validation: Optional[ResponseValidation] = None,
+        response_validation_sample: Optional[int] = None,
+        batch: bool = False,
+        etag: Union[bool, Callable[..., Optional[str]]] = False,
+        last_modified: Optional[Callable[..., Optional[datetime]]] = None,
+        validate_in_process_pool: Union[bool, int] = False,
         **options: Any,
     ) -> Callable:
         return super().delete(
@@ -369,6 +511,12 @@ class Sugar(Flask):
             response_model_exclude_unset=response_model_exclude_unset,
             response_model_exclude_defaults=response_model_exclude_defaults,
             response_model_exclude_none=response_model_exclude_none,
+            response_validation=response_validation,
+            response_validation_sample=response_validation_sample,
+            batch=batch,
+            etag=etag,
+            last_modified=last_modified,
+            validate_in_process_pool=validate_in_process_pool,
             **options,
         )
 
@@ -395,6 +543,12 @@ class Sugar(Flask):
         response_model_exclude_unset: bool = False,
         response_model_exclude_defaults: bool = False,
         response_model_exclude_none: bool = False,
+        response_validation: Optional[ResponseValidation] = None,
+        response_validation_sample: Optional[int] = None,
+        batch: bool = False,
+        etag: Union[bool, Callable[..., Optional[str]]] = False,
+        last_modified: Optional[Callable[..., Optional[datetime]]] = None,
+        validate_in_process_pool: Union[bool, int] = False,
         **options: Any,
     ) -> Callable:
         return super().patch(
@@ -419,5 +573,11 @@ class Sugar(Flask):
             response_model_exclude_unset=response_model_exclude_unset,
             response_model_exclude_defaults=response_model_exclude_defaults,
             response_model_exclude_none=response_model_exclude_none,
+            response_validation=response_validation,
+            response_validation_sample=response_validation_sample,
+            batch=batch,
+            etag=etag,
+            last_modified=last_modified,
+            validate_in_process_pool=validate_in_process_pool,
             **options,
         )
@@ -0,0 +1,148 @@
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple, Type
+
+from pydantic import BaseModel
+
+from flask_sugar.compat import PYDANTIC_V2, Errors, get_scalar_validator, validate_items
+
+try:
+    import numpy  # type:ignore[import]
+except ImportError:  # pragma: no coverage
+    numpy = None
+
+# numpy dtype kinds which a column may be coerced from in bulk
+NUMPY_KINDS: Dict[Callable[[Any], Any], str] = {}
+
+if not PYDANTIC_V2:
+    from pydantic import Extra
+    from pydantic.error_wrappers import ErrorWrapper
+    from pydantic.errors import MissingError, NoneIsNotAllowedError
+    from pydantic.fields import ModelField, Undefined
+    from pydantic.validators import float_validator, int_validator
+
+    from flask_sugar.compat import get_error_dicts
+
+    NUMPY_KINDS.update({int_validator: "i", float_validator: "iuf"})
+
+
+class BatchField(NamedTuple):
+    name: str
+    alias: str
+    field: "ModelField"
+    validator: Optional[Callable[[Any], Any]]
+
+
+def prefix_errors(index: int, errors: Errors) -> Errors:
+    return [{**error, "loc": (index, *error["loc"])} for error in errors]
+
+
+def coerce_column(column: List[Any], field: BatchField) -> Optional[List[Any]]:
+    """
+    return the validated column if all of its values can be coerced in bulk,
+    else None to validate it value by value
+    """
+    kinds = NUMPY_KINDS.get(field.validator)  # type:ignore
+    if numpy is not None and kinds is not None:
+        try:
+            array = numpy.asarray(column)
+        except (ValueError, TypeError):
+            return None
+        if array.ndim == 1 and array.dtype.kind in kinds:
+            return array.astype(field.field.type_).tolist()
+    type_ = field.field.type_
+    if all(type(value) is type_ for value in column):
+        return column
+    return None
+
+
+class BatchValidator:
+    """
+    validate a list of dicts column by column: unconstrained str/int/float/bool fields
+    are coerced in bulk, with numpy if it is installed, other fields are validated
+    value by value, then the models are built with construct,
+    with pydantic v2 the whole list is validated by pydantic-core instead
+    """
+
+    def __init__(self, model: Type[BaseModel]) -> None:
+        self.model = model
+        if PYDANTIC_V2:
+            self.fields: Tuple[BatchField, ...] = ()
+            self.per_item = True
+            return
+        self.fields = tuple(
+            BatchField(
+                name=name,
+                alias=field.alias,
+                field=field,
+                validator=None if field.allow_none else get_scalar_validator(field),
+            )
+            for name, field in model.__fields__.items()
+        )
+        config = model.__config__
+        # validation of these models is not a plain function of each field value
+        self.per_item = bool(
+            model.__pre_root_validators__
+            or model.__post_root_validators__
+            or config.extra != Extra.ignore
+            or config.allow_population_by_field_name
+            or any(field.class_validators for field in model.__fields__.values())
+        )
+
+    def __call__(self, items: Any) -> Tuple[List[BaseModel], Errors]:
+        if (
+            self.per_item
+            or not isinstance(items, list)
+            or not all(type(item) is dict for item in items)
+        ):
+            return validate_items(self.model, items)
+
+        columns: Dict[str, List[Any]] = {}
+        fields_sets: List[Set[str]] = [set() for _ in items]
+        errors: List[Tuple[int, ErrorWrapper]] = []
+        for batch_field in self.fields:
+            name, alias, field, validator = batch_field
+            column = [item.get(alias, Undefined) for item in items]
+            values = None if validator is None else coerce_column(column, batch_field)
+            if values is not None:
+                for fields_set in fields_sets:
+                    fields_set.add(name)
+                columns[name] = values
+                continue
+            values = []
+            for index, value in enumerate(column):
+                if value is Undefined:
+                    if field.required:
+                        errors.append((index, ErrorWrapper(MissingError(), loc=alias)))
+                    values.append(field.get_default())
+                    continue
+                fields_sets[index].add(name)
+                if validator is None:
+                    value, error = field.validate(value, {}, loc=alias, cls=self.model)
+                    if error:
+                        errors.append((index, error))  # type:ignore
+                    values.append(value)
+                    continue
+                if value is None:
+                    errors.append((index, ErrorWrapper(NoneIsNotAllowedError(), loc=alias)))
+                    values.append(None)
+                    continue
+                try:
+                    values.append(validator(value))
+                except (ValueError, TypeError, AssertionError) as exc:
+                    errors.append((index, ErrorWrapper(exc, loc=alias)))
+                    values.append(None)
+            columns[name] = values
+
+        if errors:
+            # report them item by item like per item validation, sorted is stable
+            # so the errors of an item keep the order of the fields
+            return [], [
+                error_dict
+                for index, error in sorted(errors, key=lambda x: x[0])
+                for error_dict in prefix_errors(index, get_error_dicts([error], self.model))
+            ]
+        construct = self.model.construct
+        names = tuple(columns)
+        return [
+            construct(fields_set, **dict(zip(names, row)))
+            for fields_set, row in zip(fields_sets, zip(*columns.values()))
+        ], []
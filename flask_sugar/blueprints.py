@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Type, Union
 
 from flask import Blueprint as _Blueprint
@@ -7,6 +8,9 @@ from pydantic import BaseModel
 if TYPE_CHECKING:
     from pydantic.typing import AbstractSetIntStr, MappingIntStrAny
 
+    from flask_sugar.cache import ResponseCache
+    from flask_sugar.view import ResponseValidation
+
 
 class Blueprint(_Blueprint):
     def __init__(
@@ -64,6 +68,14 @@ class Blueprint(_Blueprint):
         response_model_exclude_unset: bool = False,
         response_model_exclude_defaults: bool = False,
         response_model_exclude_none: bool = False,
+        response_validation: Optional["ResponseValidation"] = None,
+        response_validation_sample: Optional[int] = None,
+        batch: bool = False,
+        coalesce: bool = False,
+        cache: Optional["ResponseCache"] = None,
+        etag: Union[bool, Callable[..., Optional[str]]] = False,
+        last_modified: Optional[Callable[..., Optional[datetime]]] = None,
+        validate_in_process_pool: Union[bool, int] = False,
         **options: Any,
     ) -> None:
         """Like :meth:`Flask.add_url_rule` but for a blueprint.  The endpoint for
@@ -102,6 +114,14 @@ class Blueprint(_Blueprint):
                 response_model_exclude_unset=response_model_exclude_unset,
                 response_model_exclude_defaults=response_model_exclude_defaults,
                 response_model_exclude_none=response_model_exclude_none,
+                response_validation=response_validation,
+                response_validation_sample=response_validation_sample,
+                batch=batch,
+                coalesce=coalesce,
+                cache=cache,
+                etag=etag,
+                last_modified=last_modified,
+                validate_in_process_pool=validate_in_process_pool,
                 **options,
             )
         )
@@ -130,6 +150,14 @@ class Blueprint(_Blueprint):
         response_model_exclude_unset: bool = False,
         response_model_exclude_defaults: bool = False,
         response_model_exclude_none: bool = False,
+        response_validation: Optional["ResponseValidation"] = None,
+        response_validation_sample: Optional[int] = None,
+        batch: bool = False,
+        coalesce: bool = False,
+        cache: Optional["ResponseCache"] = None,
+        etag: Union[bool, Callable[..., Optional[str]]] = False,
+        last_modified: Optional[Callable[..., Optional[datetime]]] = None,
+        validate_in_process_pool: Union[bool, int] = False,
         **options: Any,
     ) -> Callable:
         return super().get(
@@ -155,6 +183,14 @@ class Blueprint(_Blueprint):
             response_model_exclude_unset=response_model_exclude_unset,
             response_model_exclude_defaults=response_model_exclude_defaults,
             response_model_exclude_none=response_model_exclude_none,
+            response_validation=response_validation,
+            response_validation_sample=response_validation_sample,
+            batch=batch,
+            coalesce=coalesce,
+            cache=cache,
+            etag=etag,
+            last_modified=last_modified,
+            validate_in_process_pool=validate_in_process_pool,
             **options,
         )
 
@@ -182,6 +218,12 @@ class Blueprint(_Blueprint):
         response_model_exclude_unset: bool = False,
         response_model_exclude_defaults: bool = False,
         response_model_exclude_none: bool = False,
+        response_validation: Optional["ResponseValidation"] = None,
+        response_validation_sample: Optional[int] = None,
+        batch: bool = False,
+        etag: Union[bool, Callable[..., Optional[str]]] = False,
+        last_modified: Optional[Callable[..., Optional[datetime]]] = None,
+        validate_in_process_pool: Union[bool, int] = False,
         **options: Any,
     ) -> Callable:
         return super().post(
@@ -207,6 +249,12 @@ class Blueprint(_Blueprint):
             response_model_exclude_unset=response_model_exclude_unset,
             response_model_exclude_defaults=response_model_exclude_defaults,
             response_model_exclude_none=response_model_exclude_none,
+            response_validation=response_validation,
+            response_validation_sample=response_validation_sample,
+            batch=batch,
+            etag=etag,
+            last_modified=last_modified,
+            validate_in_process_pool=validate_in_process_pool,
             **options,
         )
 
@@ -234,6 +282,12 @@ class Blueprint(_Blueprint):
         response_model_exclude_unset: bool = False,
         response_model_exclude_defaults: bool = False,
         response_model_exclude_none: bool = False,
+        response_validation: Optional["ResponseValidation"] = None,
+        response_validation_sample: Optional[int] = None,
+        batch: bool = False,
+        etag: Union[bool, Callable[..., Optional[str]]] = False,
+        last_modified: Optional[Callable[..., Optional[datetime]]] = None,
+        validate_in_process_pool: Union[bool, int] = False,
         **options: Any,
     ) -> Callable:
         return super().put(
@@ -259,6 +313,12 @@ class Blueprint(_Blueprint):
             response_model_exclude_unset=response_model_exclude_unset,
             response_model_exclude_defaults=response_model_exclude_defaults,
             response_model_exclude_none=response_model_exclude_none,
+            response_validation=response_validation,
+            response_validation_sample=response_validation_sample,
+            batch=batch,
+            etag=etag,
+            last_modified=last_modified,
+            validate_in_process_pool=validate_in_process_pool,
             **options,
         )
 
@@ -286,6 +346,12 @@ class Blueprint(_Blueprint):
         response_model_exclude_unset: bool = False,
         response_model_exclude_defaults: bool = False,
         response_model_exclude_none: bool = False,
+        response_validation: Optional["ResponseValidation"] = None,
+        response_validation_sample: Optional[int] = None,
+        batch: bool = False,
+        etag: Union[bool, Callable[..., Optional[str]]] = False,
+        last_modified: Optional[Callable[..., Optional[datetime]]] = None,
+        validate_in_process_pool: Union[bool, int] = False,
         **options: Any,
     ) -> Callable:
         return super().delete(
@@ -311,6 +377,12 @@ class Blueprint(_Blueprint):
             response_model_exclude_unset=response_model_exclude_unset,
             response_model_exclude_defaults=response_model_exclude_defaults,
             response_model_exclude_none=response_model_exclude_none,
+            response_validation=response_validation,
+            response_validation_sample=response_validation_sample,
+            batch=batch,
+            etag=etag,
+            last_modified=last_modified,
+            validate_in_process_pool=validate_in_process_pool,
             **options,
         )
 
@@ -338,6 +410,12 @@ class Blueprint(_Blueprint):
         response_model_exclude_unset: bool = False,
         response_model_exclude_defaults: bool = False,
         response_model_exclude_none: bool = False,
+        response_validation: Optional["ResponseValidation"] = None,
+        response_validation_sample: Optional[int] = None,
+        batch: bool = False,
+        etag: Union[bool, Callable[..., Optional[str]]] = False,
+        last_modified: Optional[Callable[..., Optional[datetime]]] = None,
+        validate_in_process_pool: Union[bool, int] = False,
         **options: Any,
     ) -> Callable:
         return super().patch(
@@ -363,5 +441,11 @@ class Blueprint(_Blueprint):
             response_model_exclude_unset=response_model_exclude_unset,
             response_model_exclude_defaults=response_model_exclude_defaults,
             response_model_exclude_none=response_model_exclude_none,
+            response_validation=response_validation,
+            response_validation_sample=response_validation_sample,
+            batch=batch,
+            etag=etag,
+            last_modified=last_modified,
+            validate_in_process_pool=validate_in_process_pool,
             **options,
         )
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from flask import current_app
+
+
+class CacheBackend(ABC):
+    """storage of a ResponseCache, subclass it to share the cache between processes"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """return the value of key, None if it is missing or expired"""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        """store value under key for ttl seconds, forever if ttl is None"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """delete key if it exists"""
+
+    @abstractmethod
+    def clear(self, prefix: str) -> None:
+        """delete all the keys starting with prefix"""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """in-process backend, evicts the least recently used entry beyond max_entries"""
+
+    def __init__(self, max_entries: Optional[int] = 1024) -> None:
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[str, Tuple[Optional[float], bytes]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires is not None and expires <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self.lock:
+            self.entries[key] = (expires, value)
+            self.entries.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self, prefix: str) -> None:
+        with self.lock:
+            for key in [key for key in self.entries if key.startswith(prefix)]:
+                del self.entries[key]
+
+
+def json_default(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    return str(value)
+
+
+class ResponseCache:
+    """
+    cache the successful responses of views, keyed by endpoint and validated parameters,
+    the same ResponseCache can be shared by several views
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = 1024,
+        backend: Optional[CacheBackend] = None,
+    ) -> None:
+        self.ttl = ttl
+        self.backend = MemoryCacheBackend(max_entries) if backend is None else backend
+
+    @staticmethod
+    def get_key(endpoint: str, values: Dict[str, Any]) -> str:
+        data = json.dumps(values, sort_keys=True, separators=(",", ":"), default=json_default)
+        return f"{endpoint}:{hashlib.sha256(data.encode()).hexdigest()}"
+
+    def load(self, key: str) -> Any:
+        data = self.backend.get(key)
+        if data is None:
+            return None
+        head, body = data.split(b"\n", 1)
+        status, headers = json.loads(head)
+        return current_app.response_class(body, status=status, headers=headers)
+
+    def store(self, key: str, response: Any) -> None:
+        """only complete 2xx responses without cookies are cached"""
+        if (
+            not 200 <= response.status_code < 300
+            or response.is_streamed
+            or "Set-Cookie" in response.headers
+        ):
+            return
+        head = json.dumps([response.status_code, list(response.headers.items())])
+        self.backend.set(key, head.encode() + b"\n" + response.get_data(), self.ttl)
+
+    def invalidate(self, endpoint: str, values: Optional[Dict[str, Any]] = None) -> None:
+        """
+        drop the entry of the validated values, or all the entries of endpoint if values is None
+        """
+        if values is None:
+            self.backend.clear(f"{endpoint}:")
+        else:
+            self.backend.delete(self.get_key(endpoint, values))
@@ -0,0 +1,53 @@
+import json
+from typing import Optional
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from flask_sugar.compat import pydantic_encoder
+from flask_sugar.openapi import build_openapi_json
+
+sugar_cli = AppGroup("sugar", help="Flask Sugar commands.")
+openapi_cli = AppGroup("openapi", help="OpenAPI document commands.")
+sugar_cli.add_command(openapi_cli)
+
+
+@openapi_cli.command("export")
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, writable=True),
+    default="openapi.json",
+    show_default=True,
+    help="File to write the OpenAPI document to.",
+)
+@click.option(
+    "-f",
+    "--format",
+    "format_",
+    type=click.Choice(["json", "yaml"]),
+    default=None,
+    help="Output format, guessed from the output file extension by default.",
+)
+@click.option("--indent", type=int, default=2, show_default=True, help="JSON indent.")
+def export_openapi(output: str, format_: Optional[str], indent: int) -> None:
+    """Export the OpenAPI document of the app."""
+    if format_ is None:
+        format_ = "yaml" if output.endswith((".yaml", ".yml")) else "json"
+    openapi_json = build_openapi_json(current_app)  # type:ignore
+    if format_ == "json":
+        content = json.dumps(openapi_json, indent=indent, default=pydantic_encoder)
+    else:
+        try:
+            import yaml
+        except ImportError:
+            raise click.ClickException("PyYAML is required to export the document as YAML.")
+        content = yaml.safe_dump(
+            json.loads(json.dumps(openapi_json, default=pydantic_encoder)),
+            allow_unicode=True,
+            sort_keys=False,
+        )
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(content)
+    click.echo(f"OpenAPI document written to {output}")
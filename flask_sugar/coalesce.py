@@ -0,0 +1,55 @@
+import threading
+from typing import Any, Dict, Hashable, NamedTuple, Optional, Tuple
+
+from werkzeug.datastructures import Headers
+
+
+class SharedResponse(NamedTuple):
+    data: bytes
+    status: int
+    headers: Headers
+
+
+class Flight:
+    """a call in flight, followers wait for its result"""
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+    def wait(self) -> Any:
+        self.event.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+    """share the result of a call with the identical calls made while it is in flight"""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.flights: Dict[Hashable, Flight] = {}
+
+    def join(self, key: Hashable) -> Tuple[Flight, bool]:
+        """return the flight of key and whether the caller leads it"""
+        with self.lock:
+            flight = self.flights.get(key)
+            if flight is not None:
+                return flight, False
+            flight = self.flights[key] = Flight()
+            return flight, True
+
+    def land(
+        self,
+        key: Hashable,
+        flight: Flight,
+        result: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        flight.result = result
+        flight.error = error
+        with self.lock:
+            del self.flights[key]
+        flight.event.set()
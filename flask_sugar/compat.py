@@ -0,0 +1,365 @@
+"""
+the pydantic api used by flask-sugar, on top of pydantic v1 or pydantic v2 (pydantic-core)
+"""
+
+import inspect
+import typing
+from collections import Counter
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    ForwardRef,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
+
+from pydantic import VERSION as PYDANTIC_VERSION
+from pydantic import BaseModel, ValidationError, create_model
+
+PYDANTIC_V2 = PYDANTIC_VERSION.startswith("2.")
+
+Errors = List[Dict[str, Any]]
+Loc = Union[int, str, Tuple[Union[int, str], ...]]
+
+if PYDANTIC_V2:
+    import dataclasses
+    from enum import Enum
+
+    from pydantic import Field, TypeAdapter
+    from pydantic.fields import FieldInfo
+    from pydantic.json_schema import GenerateJsonSchema
+    from pydantic_core import PydanticUndefined as Undefined
+    from pydantic_core import from_json, to_jsonable_python
+    from typing_extensions import Annotated, get_args, get_origin
+
+    TypeModelOrEnum = Union[Type[BaseModel], Type[Enum]]
+    TypeModelSet = Set[TypeModelOrEnum]
+
+    default_ref_template = "#/definitions/{model}"
+    pydantic_encoder = to_jsonable_python
+
+    class OpenAPIJsonSchema(GenerateJsonSchema):
+        """
+        OpenAPI 3.0 has no null type, optional values are marked nullable
+        instead of {"anyOf": [..., {"type": "null"}]}
+        """
+
+        def nullable_schema(self, schema: Any) -> Dict[str, Any]:
+            inner = self.generate_inner(schema["schema"])
+            if "$ref" in inner:
+                return {"allOf": [inner], "nullable": True}
+            return {**inner, "nullable": True}
+
+    FIELD_PARAMETERS = set(inspect.signature(Field).parameters) - {"extra"}
+
+    def make_field_info(
+        default: Any,
+        *,
+        regex: Optional[str] = None,
+        max_items: Optional[int] = None,
+        **kwargs: Any,
+    ) -> FieldInfo:
+        """v1 style Field arguments, unknown arguments go to the json schema like in v1"""
+        extra = {name: kwargs.pop(name) for name in list(kwargs) if name not in FIELD_PARAMETERS}
+        if regex is not None:
+            kwargs["pattern"] = regex
+        if max_items is not None:
+            kwargs["max_length"] = max_items
+        return Field(default, json_schema_extra=extra or None, **kwargs)
+
+    def evaluate_forwardref(type_: ForwardRef, globalns: Any, localns: Any) -> Any:
+        return typing._eval_type(type_, globalns, localns)  # type:ignore
+
+    def create_model_from_typeddict(typeddict: Any, __module__: str) -> Type[BaseModel]:
+        required_keys = typeddict.__required_keys__
+        field_definitions = {
+            name: (annotation, ... if name in required_keys else None)
+            for name, annotation in typing.get_type_hints(typeddict).items()
+        }
+        return create_model(  # type:ignore
+            typeddict.__name__, __module__=__module__, **field_definitions
+        )
+
+    def get_field_alias(model: Type[BaseModel], name: str) -> str:
+        return model.model_fields[name].alias or name
+
+    def is_field_required(model: Type[BaseModel], name: str) -> bool:
+        return model.model_fields[name].is_required()
+
+    def get_model_fields(model: Type[BaseModel]) -> Dict[str, Any]:
+        return model.model_fields
+
+    def get_constraints(annotation: Any, field_info: FieldInfo) -> Tuple[Any, Dict[str, Any]]:
+        """
+        split an annotation like conint(ge=1) and the constraints of its Field
+        into the plain type and all the constraints, like (int, {"ge": 1})
+        """
+        metadata = list(field_info.metadata)
+        if get_origin(annotation) is Annotated:
+            annotation, *extra = get_args(annotation)
+            metadata.extend(extra)
+        constraints = {}
+        for item in metadata:
+            if item is None:
+                continue
+            if dataclasses.is_dataclass(item):
+                values = {
+                    field.name: getattr(item, field.name) for field in dataclasses.fields(item)
+                }
+            else:
+                values = dict(vars(item))
+            constraints.update((key, value) for key, value in values.items() if value is not None)
+        return annotation, constraints
+
+    def get_scalar_validator(field: Any) -> Optional[Callable[[Any], Any]]:
+        """pydantic-core validates the whole model faster than field by field"""
+        return None
+
+    def model_validate(model: Type[BaseModel], obj: Any) -> BaseModel:
+        return model.model_validate(obj)
+
+    def model_validate_json(model: Type[BaseModel], data: bytes) -> BaseModel:
+        """parse and validate the json bytes in one pass of pydantic-core"""
+        return model.model_validate_json(data)
+
+    def load_json(model: Type[BaseModel], data: bytes) -> Any:
+        """parse json bytes with the json parser of pydantic-core"""
+        try:
+            return from_json(data)
+        except ValueError as e:
+            line_error = {
+                "type": "json_invalid",
+                "loc": (),
+                "input": data,
+                "ctx": {"error": str(e)},
+            }
+            raise ValidationError.from_exception_data(model.__name__, [line_error])  # type:ignore
+
+    def model_construct(model: Type[BaseModel], values: Dict[str, Any]) -> BaseModel:
+        return model.model_construct(**values)
+
+    def model_dump(model: BaseModel, **options: Any) -> Dict[str, Any]:
+        return model.model_dump(**options)
+
+    def get_json_encoder(model: BaseModel) -> Callable[[Any], Any]:
+        return to_jsonable_python
+
+    def model_json_schema(model: Type[BaseModel], ref_template: str) -> Dict[str, Any]:
+        return model.model_json_schema(
+            ref_template=ref_template, schema_generator=OpenAPIJsonSchema
+        )
+
+    def get_errors(exc: ValidationError) -> Errors:
+        """
+        the errors without the input and the url, with the context made json serializable,
+        errors of the whole input are located at "__root__" like in v1
+        """
+        errors = exc.errors(include_url=False, include_input=False)
+        for error in errors:
+            if not error["loc"]:
+                error["loc"] = ("__root__",)
+            ctx = error.get("ctx")
+            if ctx:
+                error["ctx"] = {
+                    key: value if isinstance(value, (str, int, float, bool)) else str(value)
+                    for key, value in ctx.items()
+                }
+        return errors  # type:ignore
+
+    def make_error(
+        type_: str, loc: Loc, model: Type[BaseModel], ctx: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        line_error: Dict[str, Any] = {
+            "type": type_,
+            "loc": loc if isinstance(loc, tuple) else (loc,),
+            "input": None,
+        }
+        if ctx:
+            line_error["ctx"] = ctx
+        exc = ValidationError.from_exception_data(model.__name__, [line_error])  # type:ignore
+        return get_errors(exc)[0]
+
+    def missing_error(loc: Loc, model: Type[BaseModel]) -> Dict[str, Any]:
+        return make_error("missing", loc, model)
+
+    def max_items_error(
+        loc: Loc, limit_value: int, length: int, model: Type[BaseModel]
+    ) -> Dict[str, Any]:
+        ctx = {"field_type": "List", "max_length": limit_value, "actual_length": length}
+        return make_error("too_long", loc, model, ctx)
+
+    def value_error(exc: Exception, loc: Loc, model: Type[BaseModel]) -> Dict[str, Any]:
+        return make_error("value_error", loc, model, {"error": exc})
+
+    @lru_cache(maxsize=None)
+    def get_list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+        return TypeAdapter(List[model])  # type:ignore
+
+    def validate_items(model: Type[BaseModel], items: Any) -> Tuple[List[BaseModel], Errors]:
+        """validate a list of dicts in pydantic-core, the errors are located by item index"""
+        try:
+            return get_list_adapter(model).validate_python(items), []
+        except ValidationError as e:
+            return [], get_errors(e)
+
+    def get_flat_models_from_models(models: Iterable[TypeModelOrEnum]) -> TypeModelSet:
+        """json schemas of v2 models carry their nested models in $defs"""
+        return set(models)
+
+    def get_long_model_name(model: TypeModelOrEnum) -> str:
+        return f"{model.__module__}__{model.__qualname__}".replace(".", "__")
+
+    def get_model_name_map(unique_models: TypeModelSet) -> Dict[TypeModelOrEnum, str]:
+        counter = Counter(model.__name__ for model in unique_models)
+        return {
+            model: get_long_model_name(model) if counter[model.__name__] > 1 else model.__name__
+            for model in unique_models
+        }
+
+    def model_process_schema(
+        model: TypeModelOrEnum,
+        *,
+        by_alias: bool = True,
+        model_name_map: Dict[TypeModelOrEnum, str],
+        ref_prefix: Optional[str] = None,
+        ref_template: str = default_ref_template,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Set[str]]:
+        if ref_prefix:
+            ref_template = ref_prefix + "{model}"
+        m_schema = TypeAdapter(model).json_schema(
+            by_alias=by_alias, ref_template=ref_template, schema_generator=OpenAPIJsonSchema
+        )
+        m_definitions = m_schema.pop("$defs", {})
+        return m_schema, m_definitions, set()
+
+else:
+    from pydantic import create_model_from_typeddict as create_model_from_typeddict
+    from pydantic.error_wrappers import ErrorWrapper
+    from pydantic.errors import ListError, ListMaxLengthError, MissingError
+    from pydantic.fields import SHAPE_SINGLETON, FieldInfo, ModelField
+    from pydantic.fields import Undefined as Undefined
+    from pydantic.json import pydantic_encoder as pydantic_encoder
+    from pydantic.schema import TypeModelOrEnum, TypeModelSet
+    from pydantic.schema import default_ref_template as default_ref_template
+    from pydantic.schema import get_flat_models_from_models as get_flat_models_from_models
+    from pydantic.schema import get_model_name_map as get_model_name_map
+    from pydantic.schema import model_process_schema as model_process_schema
+    from pydantic.types import ConstrainedInt
+    from pydantic.typing import evaluate_forwardref as evaluate_forwardref
+    from pydantic.validators import bool_validator, float_validator, int_validator, str_validator
+
+    SCALAR_VALIDATORS: Dict[Type[Any], Callable[[Any], Any]] = {
+        str: str_validator,
+        int: int_validator,
+        float: float_validator,
+        bool: bool_validator,
+    }
+
+    def make_field_info(default: Any, **kwargs: Any) -> FieldInfo:
+        return FieldInfo(default, **kwargs)
+
+    def get_field_alias(model: Type[BaseModel], name: str) -> str:
+        return model.__fields__[name].alias
+
+    def is_field_required(model: Type[BaseModel], name: str) -> bool:
+        return bool(model.__fields__[name].required)
+
+    def get_model_fields(model: Type[BaseModel]) -> Dict[str, Any]:
+        return model.__fields__
+
+    def get_constraints(annotation: Any, field_info: FieldInfo) -> Tuple[Any, Dict[str, Any]]:
+        """
+        split an annotation like conint(ge=1) and the constraints of its Field
+        into the plain type and all the constraints, like (int, {"ge": 1})
+        """
+        constraints = {name: getattr(field_info, name) for name in field_info.get_constraints()}
+        if isinstance(annotation, type) and issubclass(annotation, ConstrainedInt):
+            for name in ("gt", "ge", "lt", "le", "multiple_of"):
+                if getattr(annotation, name) is not None:
+                    constraints[name] = getattr(annotation, name)
+            if annotation.strict:
+                constraints["strict"] = True
+            annotation = int
+        return annotation, constraints
+
+    def get_scalar_validator(field: ModelField) -> Optional[Callable[[Any], Any]]:
+        """
+        return the pydantic validator of an unconstrained str/int/float/bool field, else None
+        """
+        if (
+            field.shape != SHAPE_SINGLETON
+            or field.sub_fields
+            or field.pre_validators
+            or field.post_validators
+            or len(field.validators) != 1
+        ):
+            return None
+        return SCALAR_VALIDATORS.get(field.type_)
+
+    def model_validate(model: Type[BaseModel], obj: Any) -> BaseModel:
+        return model.parse_obj(obj)
+
+    def model_validate_json(model: Type[BaseModel], data: bytes) -> BaseModel:
+        """parse the json bytes with Config.json_loads of the model, then validate them"""
+        return model.parse_obj(load_json(model, data))
+
+    def load_json(model: Type[BaseModel], data: bytes) -> Any:
+        """
+        parse json bytes with Config.json_loads of the model,
+        the error leaves out the document which JSONDecodeError carries
+        """
+        try:
+            return model.__config__.json_loads(data)  # type:ignore
+        except (ValueError, TypeError, UnicodeDecodeError) as e:
+            error = ErrorWrapper(ValueError(f"Invalid JSON: {e}"), loc="__root__")
+            raise ValidationError([error], model) from None
+
+    def model_construct(model: Type[BaseModel], values: Dict[str, Any]) -> BaseModel:
+        return model.construct(**values)
+
+    def model_dump(model: BaseModel, **options: Any) -> Dict[str, Any]:
+        return model.dict(**options)
+
+    def get_json_encoder(model: BaseModel) -> Callable[[Any], Any]:
+        return model.__json_encoder__
+
+    def model_json_schema(model: Type[BaseModel], ref_template: str) -> Dict[str, Any]:
+        return model.schema(ref_template=ref_template)
+
+    def get_errors(exc: ValidationError) -> Errors:
+        return exc.errors()  # type:ignore
+
+    def get_error_dicts(errors: List[ErrorWrapper], model: Type[BaseModel]) -> Errors:
+        return ValidationError(errors, model).errors()  # type:ignore
+
+    def missing_error(loc: Loc, model: Type[BaseModel]) -> Dict[str, Any]:
+        return get_error_dicts([ErrorWrapper(MissingError(), loc=loc)], model)[0]  # type:ignore
+
+    def max_items_error(
+        loc: Loc, limit_value: int, length: int, model: Type[BaseModel]
+    ) -> Dict[str, Any]:
+        error = ErrorWrapper(ListMaxLengthError(limit_value=limit_value), loc=loc)  # type:ignore
+        return get_error_dicts([error], model)[0]
+
+    def value_error(exc: Exception, loc: Loc, model: Type[BaseModel]) -> Dict[str, Any]:
+        return get_error_dicts([ErrorWrapper(exc, loc=loc)], model)[0]  # type:ignore
+
+    def validate_items(model: Type[BaseModel], items: Any) -> Tuple[List[BaseModel], Errors]:
+        """validate a list of dicts item by item, report the errors with the index of the item"""
+        if not isinstance(items, list):
+            return [], get_error_dicts([ErrorWrapper(ListError(), loc="__root__")], model)
+        result = []
+        errors: Errors = []
+        for index, item in enumerate(items):
+            try:
+                result.append(model.parse_obj(item))
+            except ValidationError as e:
+                errors.extend({**error, "loc": (index, *error["loc"])} for error in e.errors())
+        return result, errors
@@ -0,0 +1,161 @@
+import re
+from enum import Enum
+from typing import Any, Callable, Dict, Match, Optional, Tuple, Type
+from uuid import UUID
+
+from werkzeug.routing import BaseConverter, Map
+
+from flask_sugar import params
+from flask_sugar.compat import FieldInfo, get_constraints
+from flask_sugar.utils import (
+    get_long_obj_name,
+    get_param_annotation,
+    get_typed_signature,
+    is_subclass,
+)
+
+RULE_PARAM = re.compile(
+    r"<(?:(?P<converter>[a-zA-Z_][a-zA-Z0-9_]*)(?:\((?P<args>.*?)\))?:)?"
+    r"(?P<name>[a-zA-Z_][a-zA-Z0-9_]*)>"
+)
+
+# the types of the values returned by the werkzeug converters
+CONVERTER_TYPES: Dict[str, Type[Any]] = {
+    "default": str,
+    "string": str,
+    "path": str,
+    "int": int,
+    "float": float,
+    "uuid": UUID,
+}
+INT_BOUNDS = {"gt", "ge", "lt", "le"}
+
+
+class EnumConverter(BaseConverter):
+    """match the values of enum and convert them to its members, subclassed for every Enum"""
+
+    enum: Type[Enum]
+
+    def __init__(self, map: Map, *args: Any, **kwargs: Any) -> None:
+        super().__init__(map, *args, **kwargs)
+        self.members = {str(member.value): member for member in self.enum}
+        # the longest values first, so that "ab" is not matched as "a"
+        values = sorted(self.members, key=len, reverse=True)
+        self.regex = "|".join(re.escape(value) for value in values)
+
+    def to_python(self, value: str) -> Enum:
+        return self.members[value]
+
+    def to_url(self, value: Any) -> str:
+        if isinstance(value, self.enum):
+            value = value.value
+        return super().to_url(value)
+
+
+def get_int_converter(constraints: Dict[str, Any]) -> Optional[str]:
+    """convert the gt, ge, lt and le of an int to the min and max of the int converter"""
+    if not set(constraints) <= INT_BOUNDS or not all(
+        isinstance(value, int) for value in constraints.values()
+    ):
+        return None
+    minimums = [
+        constraints[name] + step for name, step in (("ge", 0), ("gt", 1)) if name in constraints
+    ]
+    maximums = [
+        constraints[name] - step for name, step in (("le", 0), ("lt", 1)) if name in constraints
+    ]
+    # the converter arguments of werkzeug can't be negative numbers
+    if any(bound < 0 for bound in minimums + maximums):
+        return None
+    args = ["signed=True"]
+    if minimums:
+        args.append(f"min={max(minimums)}")
+    if maximums:
+        args.append(f"max={min(maximums)}")
+    return f"int({', '.join(args)})"
+
+
+def get_enum_converter(
+    enum: Type[Enum], converters: Dict[str, Type[BaseConverter]]
+) -> Optional[str]:
+    """register an EnumConverter of enum in converters, if its values can be matched in a path"""
+    values = [member.value for member in enum]
+    if not values or not all(
+        isinstance(value, (str, int)) and not isinstance(value, bool) and str(value)
+        for value in values
+    ):
+        return None
+    if any("/" in str(value) for value in values):
+        return None
+    name = f"enum_{get_long_obj_name(enum)}"
+    converter = converters.setdefault(
+        name, type(f"{enum.__name__}Converter", (EnumConverter,), {"enum": enum})
+    )
+    if getattr(converter, "enum", None) is not enum:
+        return None
+    return name
+
+
+def get_converter(
+    annotation: Any, field_info: FieldInfo, converters: Dict[str, Type[BaseConverter]]
+) -> Optional[str]:
+    """
+    the converter which matches and converts a path param like its ParamModel field would,
+    for int (with gt, ge, lt or le), UUID and Enum, else None
+    """
+    annotation, constraints = get_constraints(annotation, field_info)
+    if annotation is int:
+        return get_int_converter(constraints)
+    if constraints:
+        return None
+    if annotation is UUID:
+        return "uuid"
+    if is_subclass(annotation, Enum):
+        return get_enum_converter(annotation, converters)
+    return None
+
+
+def compile_rule(
+    rule: str, view_func: Callable, converters: Dict[str, Type[BaseConverter]]
+) -> Tuple[str, Dict[str, bool]]:
+    """
+    add the converters derived from the annotations of view_func to the params of rule
+    without a converter, "/items/<item_id>" becomes "/items/<int(signed=True):item_id>",
+    return the new rule and the path params, True if their converter returns the value
+    of the annotated type already, so that they skip the validation of the ParamModel
+    """
+    path_params: Dict[str, bool] = {}
+    if "<" not in rule:
+        return rule, path_params
+    try:
+        signature = get_typed_signature(view_func)
+    except NameError:
+        # forward references defined after the registration of a lazy view,
+        # its ParamModel validates the path params
+        names = [match.group("name") for match in RULE_PARAM.finditer(rule)]
+        return rule, dict.fromkeys(names, False)
+
+    def replace(match: Match) -> str:
+        name, converter = match.group("name"), match.group("converter")
+        param = signature.parameters.get(name)
+        path_params[name] = False
+        if param is None or param.kind in (param.VAR_KEYWORD, param.VAR_POSITIONAL):
+            return match.group(0)
+        if param.default == param.empty:
+            field_info = params.Path(...).field_info
+        elif isinstance(param.default, params.Path):
+            field_info = param.default.field_info
+        else:
+            return match.group(0)
+        annotation = get_param_annotation(param)
+        if converter is None:
+            derived = get_converter(annotation, field_info, converters)
+            if derived is not None:
+                path_params[name] = True
+                return f"<{derived}:{name}>"
+            converter = "default"
+        annotation, constraints = get_constraints(annotation, field_info)
+        path_params[name] = not constraints and CONVERTER_TYPES.get(converter) is annotation
+        return match.group(0)
+
+    return RULE_PARAM.sub(replace, rule), path_params
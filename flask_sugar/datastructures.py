@@ -1,19 +1,78 @@
-from typing import Any, Callable, Iterable, Type
+import io
+import mmap
+import os
+from tempfile import SpooledTemporaryFile
+from typing import Any, Callable, Dict, Iterable, Type, Union
 
 from werkzeug.datastructures import FileStorage
 
+from flask_sugar.compat import PYDANTIC_V2
+
 
 class UploadFile(FileStorage):
-    @classmethod
-    def __get_validators__(cls: Type["UploadFile"]) -> Iterable[Callable[..., Any]]:
-        yield cls.validate
+    if PYDANTIC_V2:
+
+        @classmethod
+        def __get_pydantic_core_schema__(cls, source: Any, handler: Any) -> Any:
+            from pydantic_core import core_schema
+
+            return core_schema.no_info_plain_validator_function(cls.validate)
+
+        @classmethod
+        def __get_pydantic_json_schema__(cls, schema: Any, handler: Any) -> Dict[str, Any]:
+            return {"type": "string", "format": "binary"}
+
+    else:
+
+        @classmethod
+        def __get_validators__(cls: Type["UploadFile"]) -> Iterable[Callable[..., Any]]:
+            yield cls.validate
+
+        @classmethod
+        def __modify_schema__(cls, field_schema):
+            field_schema.update(format="binary", type="string")
 
     @classmethod
     def validate(cls: Type["UploadFile"], v: Any) -> Any:
         if not isinstance(v, FileStorage):
             raise ValueError(f"Expected UploadFile, received: {type(v)}")
+        if not isinstance(v, cls):
+            v = cls(v.stream, v.filename, v.name, headers=v.headers)
         return v
 
-    @classmethod
-    def __modify_schema__(cls, field_schema):
-        field_schema.update(format="binary", type="string")
+    def mmap(self) -> Union[mmap.mmap, memoryview]:
+        """
+        map the file into memory read-only, a file still spooled in memory, a stream without
+        a file descriptor, like BytesIO, or an empty file is returned as a memoryview instead
+        """
+        stream = self.stream
+        if isinstance(stream, SpooledTemporaryFile):
+            if not stream._rolled:  # type:ignore
+                return self.getbuffer()
+            stream = stream._file  # type:ignore
+        try:
+            fileno = stream.fileno()
+        except (AttributeError, OSError):  # io.UnsupportedOperation is an OSError
+            if isinstance(stream, io.BytesIO):
+                return stream.getbuffer()
+            if stream.seekable():
+                stream.seek(0)
+            return memoryview(stream.read())
+        stream.flush()
+        # an empty file can't be mapped
+        if os.fstat(fileno).st_size == 0:
+            return memoryview(b"")
+        return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+
+    def getbuffer(self) -> memoryview:
+        """return a memoryview of the contents without copying them into bytes"""
+        stream = self.stream
+        if isinstance(stream, SpooledTemporaryFile) and not stream._rolled:  # type:ignore
+            stream = stream._file  # type:ignore
+        if isinstance(stream, io.BytesIO):
+            return stream.getbuffer()
+        if stream.seek(0, io.SEEK_END) == 0:
+            stream.seek(0)
+            return memoryview(b"")
+        stream.seek(0)
+        return memoryview(self.mmap())
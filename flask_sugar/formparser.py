@@ -0,0 +1,113 @@
+from tempfile import SpooledTemporaryFile
+from typing import IO, Any, Dict, NamedTuple, Optional, Tuple
+
+from werkzeug.datastructures import MultiDict
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.formparser import FormDataParser, MultiPartParser
+from werkzeug.sansio.multipart import File
+
+try:
+    from werkzeug.formparser import exhaust_stream
+except ImportError:  # pragma: no coverage
+    # werkzeug>=2.3 doesn't exhaust the stream in the form parser anymore
+    def exhaust_stream(f: Any) -> Any:
+        return f
+
+
+DEFAULT_SPOOL_THRESHOLD = 500 * 1024
+
+
+class FileLimits(NamedTuple):
+    max_size: Optional[int]
+    spool_threshold: Optional[int]
+
+
+class LimitedSpooledFile(SpooledTemporaryFile):
+    """
+    keep the upload in memory up to spool_threshold bytes, then spill it to a temp file,
+    raise RequestEntityTooLarge as soon as it grows over max_size
+    """
+
+    def __init__(self, name: str, limits: FileLimits) -> None:
+        spool_threshold = limits.spool_threshold
+        if spool_threshold is None:
+            spool_threshold = DEFAULT_SPOOL_THRESHOLD
+        super().__init__(max_size=spool_threshold, mode="rb+")
+        if spool_threshold == 0:
+            self.rollover()
+        self.field_name = name
+        self.max_size = limits.max_size
+        self.size = 0
+
+    def write(self, s: Any) -> int:
+        self.size += len(s)
+        if self.max_size is not None and self.size > self.max_size:
+            raise RequestEntityTooLarge(
+                f"File {self.field_name!r} is larger than {self.max_size} bytes"
+            )
+        return super().write(s)
+
+
+class SugarMultiPartParser(MultiPartParser):
+    """create the containers of files with the limits of their File params"""
+
+    def __init__(self, *args: Any, file_limits: Dict[str, FileLimits], **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.file_limits = file_limits
+
+    def start_file_streaming(self, event: File, total_content_length: Optional[int]) -> IO[bytes]:
+        limits = self.file_limits.get(event.name)
+        if limits is None:
+            return super().start_file_streaming(event, total_content_length)
+        return LimitedSpooledFile(event.name, limits)  # type:ignore
+
+
+class SugarFormDataParser(FormDataParser):
+    """FormDataParser which enforces the File limits while the multipart body is parsed"""
+
+    def __init__(self, *args: Any, file_limits: Dict[str, FileLimits], **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.file_limits = file_limits
+
+    def get_parser_options(self) -> Dict[str, Any]:
+        """the options of MultiPartParser which the installed werkzeug supports"""
+        options: Dict[str, Any] = {}
+        # charset and errors are deprecated by werkzeug 2.3 and removed by 3.0
+        if getattr(self, "charset", "utf-8") != "utf-8":
+            options["charset"] = self.charset  # type:ignore
+        if getattr(self, "errors", "replace") != "replace":
+            options["errors"] = self.errors  # type:ignore
+        # max_form_parts was added by werkzeug 2.2.3
+        if getattr(self, "max_form_parts", None) is not None:
+            options["max_form_parts"] = self.max_form_parts  # type:ignore
+        return options
+
+    @exhaust_stream
+    def _parse_multipart(
+        self,
+        stream: IO[bytes],
+        mimetype: str,
+        content_length: Optional[int],
+        options: Dict[str, str],
+    ) -> Tuple[IO[bytes], MultiDict, MultiDict]:
+        parser = SugarMultiPartParser(
+            stream_factory=self.stream_factory,
+            max_form_memory_size=self.max_form_memory_size,
+            cls=self.cls,
+            file_limits=self.file_limits,
+            **self.get_parser_options(),
+        )
+        boundary = options.get("boundary", "").encode("ascii")
+
+        if not boundary:
+            raise ValueError("Missing boundary")
+
+        form, files = parser.parse(stream, boundary, content_length)
+        return stream, form, files
+
+    # werkzeug<2.3 looks the parse functions up in parse_functions, 3.0 has removed it
+    if hasattr(FormDataParser, "parse_functions"):
+        parse_functions = {
+            **FormDataParser.parse_functions,  # type:ignore
+            "multipart/form-data": _parse_multipart,
+        }
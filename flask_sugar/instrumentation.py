@@ -0,0 +1,121 @@
+import bisect
+import inspect
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import current_app
+
+# upper bounds in seconds, like the default buckets of prometheus
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+TimingCallback = Callable[[str, str, float], None]
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """cumulative counts of the values less than or equal to each bucket"""
+        cumulative: Dict[str, int] = {}
+        total = 0
+        for bound, count in zip((*map(str, self.buckets), "+Inf"), self.counts):
+            total += count
+            cumulative[bound] = total
+        return {"count": self.count, "sum": self.sum, "buckets": cumulative}
+
+
+class Instrumentation:
+    """
+    time the phases of the views: parameter extraction, validation, the handler call and
+    the response conversion, aggregate them in a histogram per endpoint and phase
+    """
+
+    def __init__(
+        self,
+        callback: Optional[TimingCallback] = None,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.callback = callback
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+
+    def record(self, endpoint: str, phase: str, seconds: float) -> None:
+        with self.lock:
+            histogram = self.histograms.get((endpoint, phase))
+            if histogram is None:
+                histogram = self.histograms[(endpoint, phase)] = Histogram(self.buckets)
+            histogram.observe(seconds)
+        if self.callback is not None:
+            self.callback(endpoint, phase, seconds)
+
+    def timed(self, endpoint: str, phase: str, func: Callable) -> Callable:
+        """wrap func to record its duration"""
+        record = self.record
+        perf_counter = time.perf_counter
+
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                start = perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    record(endpoint, phase, perf_counter() - start)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(endpoint, phase, perf_counter() - start)
+
+        return wrapper
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """return the histograms as {endpoint: {phase: histogram}}"""
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        with self.lock:
+            for (endpoint, phase), histogram in sorted(self.histograms.items()):
+                result.setdefault(endpoint, {})[phase] = histogram.to_dict()
+        return result
+
+    def reset(self) -> None:
+        with self.lock:
+            self.histograms.clear()
+
+
+def instrumentation_view() -> Dict[str, Any]:
+    return current_app.instrumentation.snapshot()  # type:ignore
@@ -1,3 +1,9 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from functools import partial
 from inspect import getdoc
 from typing import (
     TYPE_CHECKING,
@@ -13,28 +19,42 @@ from typing import (
     cast,
 )
 
-from flask import current_app, render_template_string
+from flask import Response, current_app, render_template_string, request
 from pydantic import BaseModel
-from pydantic.fields import ModelField, Undefined
-from pydantic.schema import (
+from werkzeug.routing import Rule
+
+from flask_sugar import params
+from flask_sugar.compat import (
     TypeModelOrEnum,
     TypeModelSet,
+    Undefined,
     default_ref_template,
+    get_field_alias,
     get_flat_models_from_models,
     get_model_name_map,
+    is_field_required,
+    model_json_schema,
     model_process_schema,
-    schema,
+    pydantic_encoder,
 )
-
 from flask_sugar.constans import ALLOW_METHODS, REF_PREFIX, REF_TEMPLATE
 from flask_sugar.templates import rapidoc_template, redoc_template, swagger_template
+from flask_sugar.utils import get_header_name
 from flask_sugar.view import ParameterInfo, View
 
+try:
+    import brotli
+except ImportError:  # pragma: no coverage
+    brotli = None
+
 if TYPE_CHECKING:
     from flask_sugar.app import Sugar
 
     current_app: Sugar
 
+RuleKey = Tuple[str, str, Optional[str], Optional[str], Tuple[str, ...]]
+ModelSchemas = Dict[Tuple[TypeModelOrEnum, str], Tuple[Dict[str, Any], Dict[str, Any]]]
+
 
 def get_openapi_json(
     openapi_version: str,
@@ -73,22 +93,77 @@ def get_openapi_json(
     return source
 
 
-def openapi_json_view() -> Dict[str, Any]:
-    paths, components = collect_paths_components()
-
-    return get_openapi_json(
-        openapi_version=current_app.openapi_version,
-        title=current_app.title,
-        version=current_app.doc_version,
-        tags=current_app.tags,
-        description=current_app.description,
-        terms_service=current_app.terms_service,
-        contact=current_app.contact,
-        license_=current_app.license_,
-        servers=current_app.servers,
-        paths=paths,
-        components=components,
+# moderate levels, the best ones take seconds on a large document
+COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {"gzip": partial(gzip.compress, compresslevel=6)}
+if brotli is not None:
+    COMPRESSORS["br"] = partial(brotli.compress, quality=5)
+
+
+class EncodedOpenAPI:
+    """the json bytes of the document, compressed on first request of each encoding"""
+
+    def __init__(self, data: bytes) -> None:
+        self.etag = hashlib.sha256(data).hexdigest()
+        self.contents: Dict[str, bytes] = {"identity": data}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def encode(cls, openapi_json: Dict[str, Any]) -> "EncodedOpenAPI":
+        data = json.dumps(openapi_json, separators=(",", ":"), default=pydantic_encoder).encode()
+        return cls(data)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "EncodedOpenAPI":
+        return cls(data)
+
+    def get_content(self, encoding: str) -> bytes:
+        content = self.contents.get(encoding)
+        if content is None:
+            with self.lock:
+                content = self.contents.get(encoding)
+                if content is None:
+                    content = COMPRESSORS[encoding](self.contents["identity"])
+                    self.contents[encoding] = content
+        return content
+
+
+def read_openapi_file(path: str) -> bytes:
+    """read an exported openapi document as json bytes"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if path.endswith((".yaml", ".yml")):
+        import yaml
+
+        data = json.dumps(yaml.safe_load(data), separators=(",", ":")).encode()
+    return data
+
+
+def openapi_json_view() -> Response:
+    if current_app.cache_openapi_json or current_app.openapi_static_path:
+        encoded = current_app.openapi_cache.get_encoded_openapi_json(current_app)
+        encodings = ["br", "gzip"]
+    else:
+        # an uncached document is built for every request, compressing it isn't worth it
+        encoded = EncodedOpenAPI.encode(build_openapi_json(current_app))
+        encodings = []
+    encoding = (
+        request.accept_encodings.best_match(
+            [encoding for encoding in encodings if encoding in COMPRESSORS], "identity"
+        )
+        or "identity"
     )
+    etag = encoded.etag if encoding == "identity" else f"{encoded.etag}-{encoding}"
+    if request.if_none_match.contains(etag):
+        resp = current_app.response_class(status=304)
+    else:
+        resp = current_app.response_class(
+            encoded.get_content(encoding), mimetype="application/json"
+        )
+        if encoding != "identity":
+            resp.headers["Content-Encoding"] = encoding
+    resp.set_etag(etag)
+    resp.vary.add("Accept-Encoding")
+    return resp
 
 
 def swagger() -> str:
@@ -120,21 +195,27 @@ def rapidoc() -> str:
 
 
 def get_parameters(
-    model: Optional[Type[BaseModel]], parameter_infos: List[ParameterInfo]
+    model: Optional[Type[BaseModel]],
+    parameter_infos: List[ParameterInfo],
+    model_schema: Optional[Dict[str, Any]] = None,
 ) -> List[Dict[str, Any]]:
     if not model:
         return []
-    model_fields: Dict[str, ModelField] = model.__fields__
-    properties = model.schema(ref_template=REF_TEMPLATE)["properties"]
+    if model_schema is None:
+        model_schema = model_json_schema(model, REF_TEMPLATE)
+    properties = model_schema["properties"]
     parameters = []
     for parameter_info in parameter_infos:
-        model_field = model_fields[parameter_info.name]
+        alias = get_field_alias(model, parameter_info.name)
         field_info = parameter_info.parameter.field_info
+        name = alias
+        if isinstance(parameter_info.parameter, params.Header):
+            name = get_header_name(parameter_info.parameter, alias)
         doc_parameter = {
-            "name": model_field.alias,
+            "name": name,
             "in": parameter_info.parameter.in_,
-            "schema": properties[model_field.alias],
-            "required": model_field.required,
+            "schema": properties[alias],
+            "required": is_field_required(model, parameter_info.name),
         }
 
         if field_info.description:
@@ -154,6 +235,7 @@ def get_flat_models_from_views(view_functions: Iterable[Callable]) -> TypeModelS
     for view in view_functions:
         if not isinstance(view, View) and getattr(view, "doc_enable"):
             continue
+        view.compile()  # type:ignore
         if view.ParamModel:
             models.append(view.ParamModel)
         if view.body_info or view.FormModel:
@@ -175,7 +257,9 @@ def schema(
     description: Optional[str] = None,
     ref_prefix: Optional[str] = None,
     ref_template: str = default_ref_template,
+    model_schemas: Optional[ModelSchemas] = None,
 ) -> Dict[str, Any]:
+    model_schemas = {} if model_schemas is None else model_schemas
     definitions = {}
     output_schema: Dict[str, Any] = {}
     if title:
@@ -183,13 +267,17 @@ def schema(
     if description:
         output_schema["description"] = description
     for model in models:
-        m_schema, m_definitions, m_nested_models = model_process_schema(
-            model,
-            by_alias=by_alias,
-            model_name_map=model_name_map,
-            ref_prefix=ref_prefix,
-            ref_template=ref_template,
-        )
+        key = (model, ref_prefix or ref_template)
+        if key not in model_schemas:
+            m_schema, m_definitions, m_nested_models = model_process_schema(
+                model,
+                by_alias=by_alias,
+                model_name_map=model_name_map,
+                ref_prefix=ref_prefix,
+                ref_template=ref_template,
+            )
+            model_schemas[key] = (m_schema, m_definitions)
+        m_schema, m_definitions = model_schemas[key]
         definitions.update(m_definitions)
         model_name = model_name_map[model]
         definitions[model_name] = m_schema
@@ -198,94 +286,224 @@ def schema(
     return output_schema
 
 
-def collect_paths_components() -> Tuple[Dict[str, Any], Dict[str, Any]]:
-    paths = {}
-    components = {}
-    flat_models = get_flat_models_from_views(current_app.view_functions.values())
-    model_name_map = get_model_name_map(flat_models)
-    schemas = schema(flat_models, model_name_map=model_name_map, ref_prefix=REF_PREFIX).get(
-        "definitions", {}
-    )
-    for rule in current_app.url_map.iter_rules():
-        view: View = cast(View, current_app.view_functions[rule.endpoint])
-        if not getattr(view, "doc_enable"):
-            continue
-        path_item = {}
+def get_rule_key(rule: Rule) -> RuleKey:
+    return (rule.endpoint, rule.rule, rule.subdomain, rule.host, tuple(sorted(rule.methods or ())))
+
+
+class OpenAPICache:
+    """
+    openapi fragments of an app, a path item per url rule and a schema per model,
+    a changed rule only recomputes its own fragments
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.RLock()
+        self.model_name_map: Dict[TypeModelOrEnum, str] = {}
+        self.model_schemas: ModelSchemas = {}
+        self.path_items: Dict[RuleKey, Optional[Dict[str, Any]]] = {}
+        self.openapi_json: Optional[Dict[str, Any]] = None
+        self.encoded_openapi_json: Optional[EncodedOpenAPI] = None
+
+    def invalidate(self, endpoint: Optional[str] = None) -> None:
+        """drop the document and the path items of endpoint, or everything if endpoint is None"""
+        with self.lock:
+            self.openapi_json = None
+            self.encoded_openapi_json = None
+            if endpoint is None:
+                self.model_name_map = {}
+                self.model_schemas.clear()
+                self.path_items.clear()
+                return
+            for key in [key for key in self.path_items if key[0] == endpoint]:
+                del self.path_items[key]
+
+    def update_model_name_map(self, model_name_map: Dict[TypeModelOrEnum, str]) -> None:
+        """fragments refer to models by name, drop them all if a known model got renamed"""
+        if any(
+            model_name_map.get(model, name) != name for model, name in self.model_name_map.items()
+        ):
+            self.model_schemas.clear()
+            self.path_items.clear()
+        self.model_name_map = model_name_map
+
+    def get_openapi_json(self, app: "Sugar") -> Dict[str, Any]:
+        with self.lock:
+            openapi_json = self.openapi_json
+            if openapi_json is None:
+                if app.openapi_static_path:
+                    openapi_json = json.loads(read_openapi_file(self.get_static_path(app)))
+                else:
+                    openapi_json = build_openapi_json(app, self)
+                self.openapi_json = openapi_json
+            return openapi_json
+
+    def get_encoded_openapi_json(self, app: "Sugar") -> "EncodedOpenAPI":
+        with self.lock:
+            encoded = self.encoded_openapi_json
+            if encoded is None:
+                if app.openapi_static_path:
+                    encoded = EncodedOpenAPI.from_bytes(
+                        read_openapi_file(self.get_static_path(app))
+                    )
+                else:
+                    encoded = EncodedOpenAPI.encode(self.get_openapi_json(app))
+                self.encoded_openapi_json = encoded
+            return encoded
+
+    @staticmethod
+    def get_static_path(app: "Sugar") -> str:
+        return os.path.join(app.root_path, app.openapi_static_path)  # type:ignore
 
-        if current_app.doc_route_filter and not current_app.doc_route_filter(view, rule):
-            continue
 
-        if rule.methods is None:
+def get_path_item(
+    view: View,
+    rule: Rule,
+    model_name_map: Dict[TypeModelOrEnum, str],
+    model_schemas: Optional[ModelSchemas] = None,
+) -> Dict[str, Any]:
+    """
+    model_schemas holds the schemas processed for components, parameters reuse them
+    instead of running model.schema() for every method of the rule
+    """
+    path_item = {}
+    param_model_schema = None
+    if view.ParamModel and model_schemas:
+        param_model_schema = model_schemas.get((view.ParamModel, REF_PREFIX), (None,))[0]
+    parameters = get_parameters(view.ParamModel, view.parameter_infos, param_model_schema)
+    for method in rule.methods or ():
+        operation = {}
+        method: str = method.lower()
+        if method not in ALLOW_METHODS:
             continue
 
-        for method in rule.methods:
-            operation = {}
-            method: str = method.lower()
-            if method not in ALLOW_METHODS:
-                continue
+        if parameters:
+            operation["parameters"] = parameters
 
-            parameters = get_parameters(view.ParamModel, view.parameter_infos)
-            if parameters:
-                operation["parameters"] = parameters
+        if view.tags:
+            operation["tags"] = view.tags
 
-            if view.tags:
-                operation["tags"] = view.tags
+        summary = view.summary or view.view_func.__name__.replace("_", " ").title()
+        if summary:
+            operation["summary"] = summary
 
-            summary = view.summary or view.view_func.__name__.replace("_", " ").title()
-            if summary:
-                operation["summary"] = summary
+        description = view.description or getdoc(view)
+        if description:
+            operation["description"] = description
 
-            description = view.description or getdoc(view)
-            if description:
-                operation["description"] = description
+        if view.deprecated:
+            operation["deprecated"] = view.deprecated
 
-            if view.deprecated:
-                operation["deprecated"] = view.deprecated
+        operation_id = view.operation_id or rule.endpoint + "__" + method
+        if operation_id:
+            operation["operationId"] = operation_id
 
-            operation_id = view.operation_id or rule.endpoint + "__" + method
-            if operation_id:
-                operation["operationId"] = operation_id
+        if view.security:
+            operation["security"] = view.security
 
-            if view.security:
-                operation["security"] = view.security
+        path_item[method] = operation
+        if view.body_info or view.FormModel:
+            if view.FormModel:
+                body_model_name = model_name_map[view.FormModel]
+                media_type = "multipart/form-data"
+            else:
+                body_model_name = model_name_map[view.body_info.model]  # type:ignore
+                media_type = view.body_info.parameter.media_type  # type:ignore
+
+            body_schema: Dict[str, Any] = {"$ref": REF_PREFIX + body_model_name}
+            if view.body_info and view.body_info.is_list:
+                body_schema = {"type": "array", "items": body_schema}
+                max_items = view.body_info.parameter.max_items
+                if max_items is not None:
+                    body_schema["maxItems"] = max_items
+            operation["requestBody"] = {
+                "content": {media_type: {"schema": body_schema}},
+                "required": True,
+            }
+        response_schema: Dict[str, Any] = {}
+        content = {"application/json": {"schema": response_schema}}
+        if view.response_model:
+            response_schema["$ref"] = REF_PREFIX + model_name_map[view.response_model]
+        if view.response_is_list:
+            content = {
+                "application/json": {"schema": {"type": "array", "items": response_schema}},
+                "application/x-ndjson": {"schema": response_schema},
+            }
 
-            path_item[method] = operation
-            if view.body_info or view.FormModel:
-                if view.FormModel:
-                    body_model_name = model_name_map[view.FormModel]
-                    media_type = "multipart/form-data"
-                else:
-                    body_model_name = model_name_map[
-                        view.body_info.model  # type:ignore
-                    ]
-                    media_type = view.body_info.parameter.media_type  # type:ignore
-
-                operation["requestBody"] = {
-                    "content": {media_type: {"schema": {"$ref": REF_PREFIX + body_model_name}}},
-                    "required": True,
-                }
-            response_schema = {}
-            if view.response_model:
-                response_schema["$ref"] = REF_PREFIX + model_name_map[view.response_model]
-
-            responses: Dict[Union[int, str], Dict[str, Any]] = {
-                view.status_code
-                or "200": {
-                    "description": view.response_description,
-                    "content": {"application/json": {"schema": response_schema}},
-                }
+        responses: Dict[Union[int, str], Dict[str, Any]] = {
+            view.status_code
+            or "200": {
+                "description": view.response_description,
+                "content": content,
             }
+        }
+
+        if view.responses:
+            responses.update(view.responses)
+        operation["responses"] = responses
+        if view.extra:
+            operation.update(view.extra)
+    return path_item
 
-            if view.responses:
-                responses.update(view.responses)
-            operation["responses"] = responses
-            if view.extra:
-                operation.update(view.extra)
-        paths.setdefault(view.path, {}).update(path_item)
+
+def collect_paths_components(
+    app: Optional["Sugar"] = None, cache: Optional[OpenAPICache] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    app = app or current_app
+    cache = cache or OpenAPICache()
+    paths: Dict[str, Any] = {}
+    components = {}
+    flat_models = get_flat_models_from_views(app.view_functions.values())
+    cache.update_model_name_map(get_model_name_map(flat_models))
+    schemas = schema(
+        flat_models,
+        model_name_map=cache.model_name_map,
+        ref_prefix=REF_PREFIX,
+        model_schemas=cache.model_schemas,
+    ).get("definitions", {})
+    for rule in app.url_map.iter_rules():
+        key = get_rule_key(rule)
+        if key not in cache.path_items:
+            view: View = cast(View, app.view_functions[rule.endpoint])
+            if (
+                not getattr(view, "doc_enable")
+                or (app.doc_route_filter and not app.doc_route_filter(view, rule))
+                or rule.methods is None
+            ):
+                cache.path_items[key] = None
+            else:
+                cache.path_items[key] = get_path_item(
+                    view, rule, cache.model_name_map, cache.model_schemas
+                )
+        path_item = cache.path_items[key]
+        if path_item is None:
+            continue
+        view_path = cast(View, app.view_functions[rule.endpoint]).path
+        paths.setdefault(view_path, {}).update(path_item)
 
         if schemas:
             components["schemas"] = schemas
-    if current_app.security_schemes:
-        components["securitySchemes"] = current_app.security_schemes
+    if app.security_schemes:
+        components["securitySchemes"] = app.security_schemes
 
     return paths, components
+
+
+def build_openapi_json(
+    app: Optional["Sugar"] = None, cache: Optional[OpenAPICache] = None
+) -> Dict[str, Any]:
+    app = app or current_app
+    paths, components = collect_paths_components(app, cache)
+
+    return get_openapi_json(
+        openapi_version=app.openapi_version,
+        title=app.title,
+        version=app.doc_version,
+        tags=app.tags,
+        description=app.description,
+        terms_service=app.terms_service,
+        contact=app.contact,
+        license_=app.license_,
+        servers=app.servers,
+        paths=paths,
+        components=components,
+    )
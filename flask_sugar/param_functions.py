@@ -1,8 +1,7 @@
 from typing import Any, Dict, Optional
 
-from pydantic.fields import Undefined
-
 from flask_sugar import params
+from flask_sugar.compat import Undefined
 
 
 def Path(
@@ -160,6 +159,9 @@ def Body(
     *,
     embed: bool = False,
     media_type: str = "application/json",
+    stream: bool = False,
+    raw_json: bool = False,
+    max_size: Optional[int] = None,
     alias: Optional[str] = None,
     title: Optional[str] = None,
     description: Optional[str] = None,
@@ -169,6 +171,7 @@ def Body(
     le: Optional[float] = None,
     min_length: Optional[int] = None,
     max_length: Optional[int] = None,
+    max_items: Optional[int] = None,
     regex: Optional[str] = None,
     example: Any = Undefined,
     examples: Optional[Dict[str, Any]] = None,
@@ -178,6 +181,9 @@ def Body(
         default,
         embed=embed,
         media_type=media_type,
+        stream=stream,
+        raw_json=raw_json,
+        max_size=max_size,
         alias=alias,
         title=title,
         description=description,
@@ -187,6 +193,7 @@ def Body(
         le=le,
         min_length=min_length,
         max_length=max_length,
+        max_items=max_items,
         regex=regex,
         example=example,
         examples=examples,
@@ -235,6 +242,8 @@ def File(
     default: Any,
     *,
     media_type: str = "multipart/form-data",
+    max_size: Optional[int] = None,
+    spool_threshold: Optional[int] = None,
     alias: Optional[str] = None,
     title: Optional[str] = None,
     description: Optional[str] = None,
@@ -252,6 +261,8 @@ def File(
     return params.File(
         default,
         media_type=media_type,
+        max_size=max_size,
+        spool_threshold=spool_threshold,
         alias=alias,
         title=title,
         description=description,
@@ -1,8 +1,9 @@
 from typing import Any, Dict, Optional
 
-from pydantic.fields import FieldInfo, Undefined
 from typing_extensions import Literal
 
+from flask_sugar.compat import Undefined, make_field_info
+
 ParamTypes = Literal["query", "header", "path", "cookie"]
 
 
@@ -31,7 +32,7 @@ class Param:
         self.deprecated = deprecated
         self.example = example
         self.examples = examples
-        self.field_info = FieldInfo(
+        self.field_info = make_field_info(
             default,
             alias=alias,
             title=title,
@@ -229,6 +230,9 @@ class Body:
         *,
         embed: bool = False,
         media_type: str = "application/json",
+        stream: bool = False,
+        raw_json: bool = False,
+        max_size: Optional[int] = None,
         alias: Optional[str] = None,
         title: Optional[str] = None,
         description: Optional[str] = None,
@@ -238,6 +242,7 @@ class Body:
         le: Optional[float] = None,
         min_length: Optional[int] = None,
         max_length: Optional[int] = None,
+        max_items: Optional[int] = None,
         regex: Optional[str] = None,
         example: Any = Undefined,
         examples: Optional[Dict[str, Any]] = None,
@@ -245,9 +250,13 @@ class Body:
     ):
         self.embed = embed
         self.media_type = media_type
+        self.stream = stream
+        self.raw_json = raw_json
+        self.max_size = max_size
+        self.max_items = max_items
         self.example = example
         self.examples = examples
-        self.field_info = FieldInfo(
+        self.field_info = make_field_info(
             default,
             alias=alias,
             title=title,
@@ -258,6 +267,7 @@ class Body:
             le=le,
             min_length=min_length,
             max_length=max_length,
+            max_items=max_items,
             regex=regex,
             **extra,
         )
@@ -316,6 +326,8 @@ class File(Form):
         default: Any,
         *,
         media_type: str = "multipart/form-data",
+        max_size: Optional[int] = None,
+        spool_threshold: Optional[int] = None,
         alias: Optional[str] = None,
         title: Optional[str] = None,
         description: Optional[str] = None,
@@ -347,3 +359,5 @@ class File(Form):
             examples=examples,
             **extra,
         )
+        self.max_size = max_size
+        self.spool_threshold = spool_threshold
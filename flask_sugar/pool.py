@@ -0,0 +1,104 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+from flask_sugar.batch import BatchValidator
+from flask_sugar.compat import (
+    Errors,
+    get_errors,
+    load_json,
+    max_items_error,
+    model_validate_json,
+    validate_items,
+)
+
+ListValidator = Callable[[Any], Tuple[List[BaseModel], Errors]]
+
+
+def validate_list_body(
+    model: Type[BaseModel], items: Any, max_items: Optional[int], validate_list: ListValidator
+) -> Tuple[Any, Errors]:
+    if max_items is not None and isinstance(items, list) and len(items) > max_items:
+        return None, [max_items_error("__root__", max_items, len(items), model)]
+    return validate_list(items)
+
+
+def validate_json_body(
+    model: Type[BaseModel],
+    data: bytes,
+    is_list: bool,
+    max_items: Optional[int],
+    validate_list: ListValidator,
+) -> Tuple[Any, Errors]:
+    """parse and validate the json bytes of a body, return the model or the errors"""
+    try:
+        if not is_list:
+            return model_validate_json(model, data), []
+        items = load_json(model, data)
+    except ValidationError as e:
+        return None, get_errors(e)
+    return validate_list_body(model, items, max_items, validate_list)
+
+
+@lru_cache(maxsize=None)
+def get_list_validator(model: Type[BaseModel], batch: bool) -> ListValidator:
+    """the list validators of a worker process, built once per model"""
+    return BatchValidator(model) if batch else partial(validate_items, model)
+
+
+def validate_in_worker(
+    model: Type[BaseModel], data: bytes, is_list: bool, max_items: Optional[int], batch: bool
+) -> Tuple[Any, Errors]:
+    """run in a worker process of ValidationPool, the model class is pickled by reference"""
+    return validate_json_body(model, data, is_list, max_items, get_list_validator(model, batch))
+
+
+class ValidationPool:
+    """
+    a process pool which parses and validates huge bodies, so that the request threads
+    keep the GIL for themselves, the processes are started on first use
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, mp_context: Any = None) -> None:
+        self.max_workers = max_workers
+        self.mp_context = mp_context
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.pid: Optional[int] = None
+        self.lock = threading.Lock()
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        """
+        a forked process, like a gunicorn worker forked from a preloaded app,
+        can't use the pool of its parent and creates its own
+        """
+        with self.lock:
+            if self.executor is None or self.pid != os.getpid():
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=self.mp_context
+                )
+                self.pid = os.getpid()
+            return self.executor
+
+    def validate(
+        self,
+        model: Type[BaseModel],
+        data: bytes,
+        is_list: bool = False,
+        max_items: Optional[int] = None,
+        batch: bool = False,
+    ) -> Tuple[Any, Errors]:
+        future = self.get_executor().submit(
+            validate_in_worker, model, data, is_list, max_items, batch
+        )
+        return future.result()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """stop the processes, with wait the bodies being validated are finished first"""
+        with self.lock:
+            executor, self.executor = self.executor, None
+            if executor is not None and self.pid == os.getpid():
+                executor.shutdown(wait=wait)
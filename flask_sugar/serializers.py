@@ -0,0 +1,35 @@
+import json
+from typing import Any, Callable, Dict
+
+from pydantic import BaseModel
+
+from flask_sugar.compat import get_json_encoder, model_dump
+
+try:
+    import orjson
+except ImportError:  # pragma: no coverage
+    orjson = None  # type:ignore
+
+JSONSerializer = Callable[[BaseModel, Dict[str, Any]], bytes]
+
+
+def stdlib_json_serializer(model: BaseModel, options: Dict[str, Any]) -> bytes:
+    return json.dumps(
+        model_dump(model, **options), default=get_json_encoder(model), separators=(",", ":")
+    ).encode()
+
+
+if orjson is not None:
+    orjson_dumps = orjson.dumps
+    OPT_NON_STR_KEYS = orjson.OPT_NON_STR_KEYS
+
+    def orjson_serializer(model: BaseModel, options: Dict[str, Any]) -> bytes:
+        return orjson_dumps(
+            model_dump(model, **options),
+            default=get_json_encoder(model),
+            option=OPT_NON_STR_KEYS,
+        )
+
+    fast_json_serializer: JSONSerializer = orjson_serializer
+else:  # pragma: no coverage
+    fast_json_serializer = stdlib_json_serializer
@@ -1,10 +1,33 @@
+import codecs
+import collections.abc
 import inspect
+import json
 import re
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type, Union
+import threading
+from collections import OrderedDict
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    ForwardRef,
+    Generator,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
-from pydantic.typing import ForwardRef, evaluate_forwardref
+from pydantic import BaseModel, create_model
+from werkzeug.exceptions import RequestEntityTooLarge
 
 from flask_sugar import params
+from flask_sugar.compat import FieldInfo, evaluate_forwardref
 
 try:
     from typing import get_origin  # type: ignore
@@ -14,6 +37,26 @@ except ImportError:  # pragma: no coverage
         return getattr(tp, "__origin__", None)
 
 
+ITERABLE_ORIGINS = {
+    list,
+    List,
+    Iterator,
+    Iterable,
+    Generator,
+    collections.abc.Iterator,
+    collections.abc.Iterable,
+    collections.abc.Generator,
+}
+
+JSON_DECODER = json.JSONDecoder()
+JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# least recently used models are dropped beyond MODEL_CACHE_SIZE, views keep their own
+MODEL_CACHE: "OrderedDict[Hashable, Type[BaseModel]]" = OrderedDict()
+MODEL_CACHE_SIZE = 1024
+MODEL_CACHE_LOCK = threading.Lock()
+
+
 def is_typed_dict(cls: Any) -> bool:
     return hasattr(cls, "__required_keys__")
 
@@ -22,10 +65,40 @@ def is_list_type(annotation: Type[Any]) -> bool:
     return annotation in [list, List] or get_origin(annotation) in [list, List]
 
 
+def get_item_type(annotation: Any) -> Any:
+    """
+    return Item of List[Item], Iterator[Item], Iterable[Item] or Generator[Item, ...], else None
+    """
+    if get_origin(annotation) not in ITERABLE_ORIGINS:
+        return None
+    args = getattr(annotation, "__args__", None)
+    return args[0] if args else None
+
+
 def get_list_value(value: Optional[str]) -> List[str]:
     return [] if value is None else value.split(",")
 
 
+def get_header_name(parameter: params.Header, alias: str) -> str:
+    """
+    the http name of a Header param, "-" replaces the underscores of the parameter name
+    unless it has an explicit alias or convert_underscores=False
+    """
+    if parameter.convert_underscores and parameter.field_info.alias is None:
+        return alias.replace("_", "-")
+    return alias
+
+
+def get_environ_key(header_name: str) -> str:
+    """
+    convert "X-Request-Id" to "HTTP_X_REQUEST_ID", the key of the header in the wsgi environ
+    """
+    key = header_name.upper().replace("-", "_")
+    if key in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+        return key
+    return f"HTTP_{key}"
+
+
 def is_subclass(x: Type[Any], y: Union[Type[Any], Tuple[Type[Any], ...]]) -> bool:
     try:
         return issubclass(x, y)
@@ -97,3 +170,152 @@ def get_long_obj_name(obj: Any, suffix: Optional[str] = None) -> str:
     if suffix:
         name += f"__{suffix}"
     return name.replace(".", "__")
+
+
+def get_model_key(
+    field_definitions: Dict[str, Tuple[Any, FieldInfo]], base: Optional[Type[BaseModel]] = None
+) -> Optional[Hashable]:
+    key = (
+        base,
+        tuple(
+            (name, annotation, repr(field_info))
+            for name, (annotation, field_info) in field_definitions.items()
+        ),
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def create_cached_model(
+    name: str,
+    field_definitions: Dict[str, Tuple[Any, FieldInfo]],
+    base: Optional[Type[BaseModel]] = None,
+) -> Type[BaseModel]:
+    """
+    create_model, but views with identical field definitions share one model class,
+    named after the first view that created it
+    """
+    key = get_model_key(field_definitions, base)
+    if key is None:
+        return create_model(name, __base__=base, **field_definitions)  # type:ignore
+    with MODEL_CACHE_LOCK:
+        model = MODEL_CACHE.get(key)
+        if model is None:
+            model = create_model(name, __base__=base, **field_definitions)  # type:ignore
+            MODEL_CACHE[key] = model
+            if len(MODEL_CACHE) > MODEL_CACHE_SIZE:
+                MODEL_CACHE.popitem(last=False)
+        else:
+            MODEL_CACHE.move_to_end(key)
+    return model
+
+
+class LimitedInputStream:
+    """
+    wrap the wsgi.input of a body without Content-Length, like a chunked one,
+    raise RequestEntityTooLarge as soon as more than max_size bytes are read from it
+    """
+
+    def __init__(self, stream: IO[bytes], max_size: int, message: str) -> None:
+        self.stream = stream
+        self.remaining = max_size
+        self.message = message
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        if size is None or size < 0:
+            return b"".join(iter(lambda: self.read(64 * 1024), b""))
+        # one byte over the limit tells a body of max_size bytes from a larger one
+        data = self.stream.read(min(size, self.remaining + 1))
+        self.remaining -= len(data)
+        if self.remaining < 0:
+            raise RequestEntityTooLarge(self.message)
+        return data
+
+    def readline(self, size: Optional[int] = -1) -> bytes:
+        if size is None or size < 0 or size > self.remaining + 1:
+            size = self.remaining + 1
+        data = self.stream.readline(size)
+        self.remaining -= len(data)
+        if self.remaining < 0:
+            raise RequestEntityTooLarge(self.message)
+        return data
+
+    def readable(self) -> bool:
+        return True
+
+
+def iter_json_array(stream: IO[bytes], chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    parse a json array from a binary stream chunk by chunk and yield its items,
+    raise ValueError if the stream is not a valid json array
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    eof = False
+    expect = "["
+    item: Any = None
+    while True:
+        pos = JSON_WHITESPACE.match(buffer, pos).end()  # type:ignore
+        if pos == len(buffer):
+            if eof:
+                raise ValueError("Unexpected end of json array")
+        else:
+            char = buffer[pos]
+            if expect == "[":
+                if char != "[":
+                    raise ValueError("Expected a json array")
+                pos += 1
+                expect = "item or ]"
+                continue
+            if expect == ",":
+                if char == "]":
+                    return
+                if char != ",":
+                    raise ValueError(f"Expecting ',' delimiter: char {char!r}")
+                pos += 1
+                expect = "item"
+                continue
+            if char == "]" and expect == "item or ]":
+                return
+            try:
+                item, end = JSON_DECODER.raw_decode(buffer, pos)
+            except ValueError:
+                if eof:
+                    raise
+                end = len(buffer)
+            # a complete item is followed by whitespace, "," or "]", otherwise
+            # it may be cut at the chunk boundary, like a number "12" of "12.5"
+            if eof or (end < len(buffer) and buffer[end] in " \t\n\r,]"):
+                yield item
+                pos = end
+                expect = ","
+                continue
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + decoder.decode(chunk, final=eof)
+        pos = 0
+
+
+def freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple((key, freeze(item)) for key, item in sorted(value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(freeze(item) for item in value)
+    hash(value)
+    return value
+
+
+def make_hashable(value: Any) -> Optional[Hashable]:
+    """
+    return a hashable equivalent of the validated values, None if some of them is unhashable
+    """
+    try:
+        return freeze(value)
+    except TypeError:
+        return None
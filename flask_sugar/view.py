@@ -1,10 +1,19 @@
-from functools import update_wrapper
+import asyncio
+import contextvars
+import inspect
+import itertools
+import threading
+from concurrent.futures import Executor
+from datetime import datetime
+from functools import partial, update_wrapper
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
     Dict,
     Generic,
+    Iterable,
+    Iterator,
     List,
     NamedTuple,
     Optional,
@@ -14,17 +23,45 @@ from typing import (
     Union,
 )
 
-from flask import make_response, request
+from flask import Request, current_app, json, make_response, request, stream_with_context
 from flask.typing import ResponseReturnValue
-from pydantic import BaseModel, ValidationError, create_model, create_model_from_typeddict
-from pydantic.fields import FieldInfo, ModelField
+from pydantic import BaseModel, ValidationError
 from typing_extensions import Literal
-from werkzeug.datastructures import ImmutableMultiDict
+from werkzeug.datastructures import Headers, ImmutableMultiDict
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.http import is_resource_modified
 
 from flask_sugar import params
+from flask_sugar.batch import BatchValidator
+from flask_sugar.cache import ResponseCache
+from flask_sugar.coalesce import Flight, SharedResponse, SingleFlight
+from flask_sugar.compat import (
+    FieldInfo,
+    create_model_from_typeddict,
+    get_errors,
+    get_field_alias,
+    get_model_fields,
+    get_scalar_validator,
+    max_items_error,
+    missing_error,
+    model_construct,
+    model_dump,
+    model_validate,
+    validate_items,
+    value_error,
+)
 from flask_sugar.datastructures import UploadFile
 from flask_sugar.exceptions import RequestValidationError
+from flask_sugar.formparser import FileLimits, SugarFormDataParser
+from flask_sugar.instrumentation import Instrumentation
+from flask_sugar.pool import ValidationPool, validate_json_body, validate_list_body
+from flask_sugar.serializers import JSONSerializer
 from flask_sugar.utils import (
+    LimitedInputStream,
+    create_cached_model,
+    get_environ_key,
+    get_header_name,
+    get_item_type,
     get_list_value,
     get_long_obj_name,
     get_param_annotation,
@@ -33,16 +70,22 @@ from flask_sugar.utils import (
     is_list_type,
     is_subclass,
     is_typed_dict,
+    iter_json_array,
+    make_hashable,
 )
 
 if TYPE_CHECKING:
     from pydantic.typing import AbstractSetIntStr, MappingIntStrAny
 
 
+ResponseValidation = Literal["full", "construct", "off"]
+
+
 class BodyInfo(NamedTuple):
     name: str
     model: Type[BaseModel]
     parameter: params.Body
+    is_list: bool = False
 
 
 ParamType = TypeVar("ParamType", params.Param, params.File)
@@ -55,6 +98,22 @@ class ParameterInfo(Generic[ParamType]):
         self.parameter = parameter
 
 
+Getter = Callable[[Request, Dict[str, Any]], Any]
+
+
+class Extractor(NamedTuple):
+    key: str
+    getter: Getter
+
+
+class ScalarField(NamedTuple):
+    name: str
+    alias: str
+    required: bool
+    default: Any
+    validator: Callable[[Any], Any]
+
+
 class View:
     """wrap view_func"""
 
@@ -81,17 +140,44 @@ class View:
         response_model_exclude_unset: bool = False,
         response_model_exclude_defaults: bool = False,
         response_model_exclude_none: bool = False,
+        response_validation: ResponseValidation = "full",
+        response_validation_sample: Optional[int] = None,
+        batch: bool = False,
+        coalesce: bool = False,
+        cache: Optional[ResponseCache] = None,
+        etag: Union[bool, Callable[..., Optional[str]]] = False,
+        last_modified: Optional[Callable[..., Optional[datetime]]] = None,
+        validate_in_process_pool: Union[bool, int] = False,
+        validation_executor: Optional[Executor] = None,
+        validation_pool: Optional[ValidationPool] = None,
+        json_serializer: Optional[JSONSerializer] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        path_params: Optional[Dict[str, bool]] = None,
+        lazy: bool = False,
     ) -> None:
 
         self.path = path
+        self.path_params = path_params
         self.view_func = view_func
+        self.endpoint = endpoint
         update_wrapper(self, view_func)  # type:ignore
+        self.is_coroutine = inspect.iscoroutinefunction(view_func)
+        self.handler = view_func
+        self.instrumentation = instrumentation
+        self.validation_executor = validation_executor
+        self.validation_pool = validation_pool
+        if isinstance(validate_in_process_pool, bool):
+            self.offload_threshold = 0 if validate_in_process_pool else None
+        else:
+            self.offload_threshold = validate_in_process_pool
+        self.json_serializer = json_serializer
         self.doc_enable = doc_enable
         self.tags = tags
         self.summary = summary
         self.description = description
         self.response_description = response_description
         self.response_model = response_model
+        self.response_is_list = False
         self.status_code = status_code
         self.responses = responses
         self.deprecated = deprecated
@@ -99,23 +185,85 @@ class View:
         self.security = security
         self.extra = extra
         self.ParamModel: Optional[Type[BaseModel]] = None
+        self.RequestModel: Optional[Type[BaseModel]] = None
         self.FormModel: Optional[Type[BaseModel]] = None
         self.FileModel: Optional[Type[BaseModel]] = None
         self.parameter_infos: List[ParameterInfo[params.Param]] = []
         self.file_infos: List[ParameterInfo[params.File]] = []
         self.body_info: Optional[BodyInfo] = None
+        self.param_extractors: Tuple[Extractor, ...] = ()
+        self.file_extractors: Tuple[Extractor, ...] = ()
+        self.file_limits: Dict[str, FileLimits] = {}
+        self.scalar_fields: Optional[Tuple[ScalarField, ...]] = None
+        self.validate_params: Callable[
+            [Dict[str, Any]], Tuple[Dict[str, Any], List[Dict[str, Any]]]
+        ] = self.validate_param_model
         self.response_model_include = response_model_include
         self.response_model_exclude = response_model_exclude
         self.response_model_by_alias = response_model_by_alias
         self.response_model_exclude_unset = response_model_exclude_unset
         self.response_model_exclude_defaults = response_model_exclude_defaults
         self.response_model_exclude_none = response_model_exclude_none
+        self.response_model_options: Dict[str, Any] = {
+            "include": response_model_include,
+            "exclude": response_model_exclude,
+            "by_alias": response_model_by_alias,
+            "exclude_unset": response_model_exclude_unset,
+            "exclude_defaults": response_model_exclude_defaults,
+            "exclude_none": response_model_exclude_none,
+        }
+        self.batch = batch
+        self.single_flight = SingleFlight() if coalesce else None
+        self.cache = cache
+        self.endpoint_name = endpoint or view_func.__name__
+        self.etag = etag
+        self.last_modified = last_modified
+        self.response_validation = response_validation
+        self.response_validation_sample = response_validation_sample
+        self.response_counter = itertools.count(1)
+        self.compiled = False
+        self.compile_lock = threading.Lock()
+        if not lazy:
+            self.compile()
+
+    def compile(self) -> None:
+        """build the models of the view once, lazy views do it on their first request"""
+        if self.compiled:
+            return
+        with self.compile_lock:
+            if not self.compiled:
+                self.build_models()
+                if self.instrumentation is not None:
+                    self.instrument()
+                self.compiled = True
 
+    def instrument(self) -> None:
+        """
+        replace the steps of the request pipeline with timed versions of them,
+        each step is its own phase so that a request records one timing per phase
+        """
+        timed = partial(self.instrumentation.timed, self.endpoint_name)  # type:ignore
+        self.extract_params = timed("extract_params", self.extract_params)
+        self.extract_files = timed("extract_files", self.extract_files)
+        self.read_body = timed("read_body", self.read_body)  # type:ignore
+        self.validate_params = timed("validate_params", self.validate_params)
+        self.validate_body = timed("validate_body", self.validate_body)  # type:ignore
+        self.validate_files = timed("validate_files", self.validate_files)  # type:ignore
+        self.handler = timed("handler", self.handler)
+        self.create_response = timed("response", self.create_response)  # type:ignore
+
+    def build_models(self) -> None:
+        # a lazy view which failed to build on a request is built again on the next one
+        self.parameter_infos = []
+        self.file_infos = []
+        self.body_info = None
         field_definitions: Dict[str, Tuple[Any, FieldInfo]] = {}
-        path_param_names = get_path_param_names(path)
-        signature = get_typed_signature(view_func)
+        path_params = self.path_params
+        if path_params is None:
+            path_params = dict.fromkeys(get_path_param_names(self.path), False)
+        signature = get_typed_signature(self.view_func)
         file_definitions: Dict[str, Tuple[Any, FieldInfo]] = {}
-        if not response_model:
+        if not self.response_model:
             if is_typed_dict(signature.return_annotation):
                 self.response_model = create_model_from_typeddict(
                     signature.return_annotation,
@@ -123,12 +271,35 @@ class View:
                 )
             elif is_subclass(signature.return_annotation, BaseModel):
                 self.response_model = signature.return_annotation
+            elif is_subclass(get_item_type(signature.return_annotation), BaseModel):
+                self.response_model = get_item_type(signature.return_annotation)
+                self.response_is_list = True
+        elif is_subclass(get_item_type(self.response_model), BaseModel):
+            self.response_model = get_item_type(self.response_model)
+            self.response_is_list = True
 
         for param_name, param in signature.parameters.items():
             if param.kind in (param.VAR_KEYWORD, param.VAR_POSITIONAL):
                 continue
             annotation = get_param_annotation(param)
-            if is_subclass(annotation, BaseModel):
+            stream_body = param.default
+            if isinstance(stream_body, params.Body) and stream_body.stream:
+                assert self.body_info is None, "a view_func require only one BaseModel field"
+                item_type = get_item_type(annotation)
+                assert is_subclass(
+                    item_type, BaseModel
+                ), "stream body field must be annotated as Iterator[BaseModel]"
+                self.body_info = BodyInfo(
+                    name=param_name,
+                    model=item_type,
+                    parameter=stream_body,
+                    is_list=True,
+                )
+                continue
+            is_list_body = is_list_type(annotation) and is_subclass(
+                get_item_type(annotation), BaseModel
+            )
+            if is_subclass(annotation, BaseModel) or is_list_body:
                 assert self.body_info is None, "a view_func require only one BaseModel field"
                 if param.default == param.empty:
                     parameter = params.Body(...)
@@ -140,8 +311,9 @@ class View:
 
                 self.body_info = BodyInfo(
                     name=param_name,
-                    model=annotation,
+                    model=get_item_type(annotation) if is_list_body else annotation,
                     parameter=parameter,
+                    is_list=is_list_body,
                 )
                 continue
             if isinstance(param.default, params.File):
@@ -159,7 +331,7 @@ class View:
                 file_definitions[param_name] = (annotation, param.default.field_info)
                 continue
 
-            if param_name in path_param_names:
+            if param_name in path_params:
                 assert (param.default == param.empty) or isinstance(
                     param.default, params.Path
                 ), "path param default value must be subclass of params.Path or empty"
@@ -182,11 +354,54 @@ class View:
                     parameter=parameter,
                 )
             )
+        if self.batch:
+            assert (
+                self.body_info and self.body_info.is_list and not self.body_info.parameter.stream
+            ), "batch view_func require a List[BaseModel] body field"
+            self.validate_body_list = BatchValidator(self.body_info.model)  # type:ignore
+
+        if self.offload_threshold is not None:
+            assert (
+                self.body_info
+                and not self.body_info.parameter.stream
+                and not isinstance(self.body_info.parameter, params.Form)
+            ), "validate_in_process_pool view_func require a json body field"
+            assert (
+                self.validation_pool is not None
+            ), "validate_in_process_pool require Sugar(validation_processes=...)"
+
+        if self.single_flight is not None or self.cache is not None:
+            assert not (
+                self.body_info or self.file_infos
+            ), "coalesce or cache view_func can't have body or file fields"
+
         if field_definitions:
-            self.ParamModel = create_model(
-                get_long_obj_name(view_func, f"{endpoint or ''}__ParamModel"),
-                **field_definitions,
+            self.ParamModel = create_cached_model(
+                get_long_obj_name(self.view_func, f"{self.endpoint or ''}__ParamModel"),
+                field_definitions,
             )
+            # path params converted to their type by their url converters skip validation
+            request_definitions = {
+                name: definition
+                for name, definition in field_definitions.items()
+                if not path_params.get(name)
+            }
+            if len(request_definitions) == len(field_definitions):
+                self.RequestModel = self.ParamModel
+            elif request_definitions:
+                self.RequestModel = create_cached_model(
+                    get_long_obj_name(self.view_func, f"{self.endpoint or ''}__RequestModel"),
+                    request_definitions,
+                )
+
+        if self.RequestModel:
+            request_infos = [
+                info for info in self.parameter_infos if not path_params.get(info.name)
+            ]
+            self.param_extractors = self.compile_extractors(request_infos, self.RequestModel)
+            self.scalar_fields = self.compile_scalar_fields(self.RequestModel)
+            if self.scalar_fields is not None:
+                self.validate_params = self.validate_scalar_params
 
         if self.file_infos:
             if self.body_info:
@@ -196,114 +411,544 @@ class View:
                 base_model = self.body_info.model
             else:
                 base_model = None
-            self.FileModel = create_model(
-                get_long_obj_name(view_func, "FileModel"), **file_definitions
+            self.FormModel = create_cached_model(
+                get_long_obj_name(self.view_func, "FormModel"), file_definitions, base_model
             )
-            self.FormModel = create_model(
-                get_long_obj_name(view_func, "FormModel"),
-                __base__=base_model,
-                **file_definitions,
+            self.FileModel = create_cached_model(
+                get_long_obj_name(self.view_func, "FileModel"), file_definitions
             )
+            self.file_extractors = self.compile_extractors(
+                self.file_infos, self.FileModel, result_use_alias=False
+            )
+            self.file_limits = {
+                get_field_alias(self.FileModel, info.name): FileLimits(
+                    max_size=info.parameter.max_size,
+                    spool_threshold=info.parameter.spool_threshold,
+                )
+                for info in self.file_infos
+                if info.parameter.max_size is not None or info.parameter.spool_threshold is not None
+            }
 
     @staticmethod
-    def get_value(
+    def compile_getter(
         in_: Literal["query", "header", "path", "cookie", "file"],
         alias: str,
         param_name: str,
         is_list: bool,
-        kwargs: Dict[str, Any],
-    ) -> Any:
+    ) -> Getter:
+        """
+        headers are read from the wsgi environ key resolved here, instead of looking up
+        request.headers case-insensitively, cookies are parsed once by request.cookies
+        """
         if in_ == "query":
-            return request.args.getlist(alias) if is_list else request.args.get(alias)
+            if is_list:
+                return lambda req, kwargs: req.args.getlist(alias)
+            return lambda req, kwargs: req.args.get(alias)
         if in_ == "header":
-            rtn = request.headers.get(alias)
-            return get_list_value(rtn) if is_list else rtn
+            key = get_environ_key(alias)
+            if is_list:
+                return lambda req, kwargs: get_list_value(req.environ.get(key))
+            return lambda req, kwargs: req.environ.get(key)
         if in_ == "cookie":
-            rtn = request.cookies.get(alias)
-            return get_list_value(rtn) if is_list else rtn
+            if is_list:
+                return lambda req, kwargs: get_list_value(req.cookies.get(alias))
+            return lambda req, kwargs: req.cookies.get(alias)
         if in_ == "file":
-            return request.files.getlist(alias) if is_list else request.files.get(alias)
-        return kwargs[param_name]
+            if is_list:
+                return lambda req, kwargs: req.files.getlist(alias)
+            return lambda req, kwargs: req.files.get(alias)
+        return lambda req, kwargs: kwargs[param_name]
 
-    def get_request_values(
+    def compile_extractors(
         self,
         parameter_infos: List[ParameterInfo],
         ParamModel: Type[BaseModel],
-        kwargs: Dict[str, Any],
         result_use_alias: bool = True,
+    ) -> Tuple[Extractor, ...]:
+        """resolve the source, alias and list-ness of every parameter once at registration"""
+        extractors = []
+        for parameter in parameter_infos:
+            alias = get_field_alias(ParamModel, parameter.name)
+            name = alias
+            if isinstance(parameter.parameter, params.Header):
+                name = get_header_name(parameter.parameter, alias)
+            getter = self.compile_getter(
+                parameter.parameter.in_, name, parameter.name, parameter.is_list
+            )
+            key = alias if result_use_alias else parameter.name
+            extractors.append(Extractor(key=key, getter=getter))
+        return tuple(extractors)
+
+    @staticmethod
+    def compile_scalar_fields(ParamModel: Type[BaseModel]) -> Optional[Tuple[ScalarField, ...]]:
+        """
+        return the fields of ParamModel if all of them are unconstrained scalars, else None
+        """
+        scalar_fields = []
+        for name, model_field in get_model_fields(ParamModel).items():
+            validator = get_scalar_validator(model_field)
+            if validator is None:
+                return None
+            scalar_fields.append(
+                ScalarField(
+                    name=name,
+                    alias=model_field.alias,
+                    required=bool(model_field.required),
+                    default=model_field.default,
+                    validator=validator,
+                )
+            )
+        return tuple(scalar_fields)
+
+    @staticmethod
+    def get_request_values(
+        extractors: Tuple[Extractor, ...], kwargs: Dict[str, Any]
     ) -> Dict[str, Any]:
+        req = request._get_current_object()  # type:ignore
         values = {}
-        model_fields: Dict[str, ModelField] = ParamModel.__fields__
-        for parameter in parameter_infos:
-            model_field = model_fields[parameter.name]
-            in_ = parameter.parameter.in_
-            alias = model_field.alias
-            value = self.get_value(in_, alias, parameter.name, parameter.is_list, kwargs)
+        for key, getter in extractors:
+            value = getter(req, kwargs)
             if value is not None:
-                if result_use_alias:
-                    values[alias] = value
-                else:
-                    values[parameter.name] = value
+                values[key] = value
         return values
 
-    def inject_data(self, kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    def extract_params(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        return self.get_request_values(self.param_extractors, kwargs)
+
+    def extract_files(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        return self.get_request_values(self.file_extractors, kwargs)
+
+    def validate_param_model(
+        self, request_values: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        try:
+            return model_dump(model_validate(self.RequestModel, request_values)), []  # type:ignore
+        except ValidationError as e:
+            return {}, get_errors(e)
+
+    def validate_scalar_params(
+        self, request_values: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        coerce unconstrained scalar params with the pydantic validators directly,
+        without building a RequestModel instance
+        """
+        values = {}
         errors = []
-        if self.ParamModel:
-            request_values = self.get_request_values(self.parameter_infos, self.ParamModel, kwargs)
+        for name, alias, required, default, validator in self.scalar_fields:  # type:ignore
+            if alias not in request_values:
+                if required:
+                    errors.append(missing_error(alias, self.RequestModel))  # type:ignore
+                else:
+                    values[name] = default
+                continue
             try:
-                param_data = self.ParamModel(**request_values)
-                kwargs.update(param_data.dict())
-            except ValidationError as e:
-                errors.extend(e.errors())
+                values[name] = validator(request_values[alias])
+            except (ValueError, TypeError, AssertionError) as exc:
+                errors.append(value_error(exc, alias, self.RequestModel))  # type:ignore
+        if errors:
+            return {}, errors
+        return values, []
+
+    def validate_body_list(self, items: Any) -> Tuple[List[BaseModel], List[Dict[str, Any]]]:
+        return validate_items(self.body_info.model, items)  # type:ignore
+
+    def load_form_data(self) -> None:
+        """
+        parse the multipart body with the limits of the File params,
+        unless something has parsed it already
+        """
+        if "form" in request.__dict__:
+            return
+        request.form_data_parser_class = partial(  # type:ignore
+            SugarFormDataParser, file_limits=self.file_limits
+        )
+        request._load_form_data()
+
+    def check_body_size(self, size: Optional[int]) -> None:
+        """raise RequestEntityTooLarge if the body is larger than the max_size of Body"""
+        max_size = self.body_info.parameter.max_size  # type:ignore
+        if max_size is not None and size is not None and size > max_size:
+            raise RequestEntityTooLarge(f"Body is larger than {max_size} bytes")
 
-        if self.body_info:
-            body_values = getattr(request, self.body_info.parameter.request_attr) or {}
-            if isinstance(body_values, ImmutableMultiDict):
-                body_values = body_values.to_dict()
+    def limit_body_size(self) -> None:
+        """
+        check Content-Length against the max_size of Body, the input of a body without it
+        is wrapped to be rejected as soon as more than max_size bytes are read
+        """
+        max_size = self.body_info.parameter.max_size  # type:ignore
+        if max_size is None:
+            return
+        if request.content_length is not None:
+            self.check_body_size(request.content_length)
+            return
+        request.environ["wsgi.input"] = LimitedInputStream(
+            request.environ["wsgi.input"], max_size, f"Body is larger than {max_size} bytes"
+        )
+
+    def read_body(self) -> Any:
+        parameter = self.body_info.parameter  # type:ignore
+        self.limit_body_size()
+        if parameter.raw_json or self.offload_threshold is not None:
+            if not request.is_json:
+                request.on_json_loading_failed(None)
+            data = request.get_data()
+            self.check_body_size(len(data))
+            return data
+        body_values = getattr(request, parameter.request_attr) or {}
+        if isinstance(body_values, ImmutableMultiDict):
+            body_values = body_values.to_dict()
+        return body_values
+
+    def validate_body(self, body_values: Any) -> Tuple[Any, List[Dict[str, Any]]]:
+        """
+        a raw_json or offloaded body is given as bytes, a model is validated from them directly,
+        a list is parsed by the json parser of pydantic first,
+        bodies reaching offload_threshold are validated in the validation_pool
+        """
+        _, model, parameter, is_list = self.body_info  # type:ignore
+        if isinstance(body_values, bytes):
+            threshold = self.offload_threshold
+            if threshold is not None and len(body_values) >= threshold:
+                return self.validation_pool.validate(  # type:ignore
+                    model, body_values, is_list, parameter.max_items, self.batch
+                )
+            return validate_json_body(
+                model, body_values, is_list, parameter.max_items, self.validate_body_list
+            )
+        if not is_list:
             try:
-                kwargs[self.body_info.name] = self.body_info.model(**body_values)
+                return model(**body_values), []
             except ValidationError as e:
-                errors.extend(e.errors())
+                return None, get_errors(e)
+        return validate_list_body(model, body_values, parameter.max_items, self.validate_body_list)
+
+    def validate_files(self, files: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        try:
+            return model_dump(model_validate(self.FileModel, files)), []  # type:ignore
+        except ValidationError as e:
+            return {}, get_errors(e)
+
+    def inject_data(self, kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        errors = []
+        if self.file_limits:
+            self.load_form_data()
+        if self.RequestModel:
+            request_values = self.extract_params(kwargs)
+            param_data, param_errors = self.validate_params(request_values)
+            kwargs.update(param_data)
+            errors.extend(param_errors)
+
+        if self.body_info and self.body_info.parameter.stream:
+            kwargs[self.body_info.name] = self.stream_body()
+        elif self.body_info:
+            body_values = self.read_body()
+            kwargs[self.body_info.name], body_errors = self.validate_body(body_values)
+            errors.extend(body_errors)
 
         if self.FileModel:
-            files = self.get_request_values(self.file_infos, self.FileModel, kwargs, False)
+            files = self.extract_files(kwargs)
+            file_data, file_errors = self.validate_files(files)
+            kwargs.update(file_data)
+            errors.extend(file_errors)
 
+        return kwargs, errors
+
+    def stream_body(self) -> Iterator[BaseModel]:
+        """
+        return an iterator which parses the json array body from request.stream
+        and validates its items lazily
+        """
+        if not request.is_json:
+            request.on_json_loading_failed(None)
+        self.limit_body_size()
+        return self.validate_body_items(iter_json_array(request.stream))
+
+    def validate_body_items(self, items: Iterator[Any]) -> Iterator[BaseModel]:
+        _, model, parameter, _ = self.body_info  # type:ignore
+        max_items = parameter.max_items
+        index = 0
+        while True:
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+            except ValueError as e:
+                request.on_json_loading_failed(e)
+                return
+            if max_items is not None and index >= max_items:
+                error = max_items_error((index,), max_items, index + 1, model)
+                raise RequestValidationError([error])
             try:
-                file_model = self.FileModel(**files)
-                kwargs.update(file_model.dict())
+                yield model_validate(model, item)
             except ValidationError as e:
-                errors.extend(e.errors())
-
-        return kwargs, errors
+                raise RequestValidationError(
+                    [{**error, "loc": (index, *error["loc"])} for error in get_errors(e)]
+                )
+            index += 1
 
     def create_response(
         self, response: Union[ResponseReturnValue, BaseModel]
     ) -> ResponseReturnValue:
+        if self.response_is_list and isinstance(response, list):
+            return self.render_list(response)
+        if self.response_is_list and isinstance(response, Iterator):
+            return self.stream_response(response)
         if isinstance(response, BaseModel):
-            return response.dict()
+            return self.render_model(response, {})
         if isinstance(response, dict) and self.response_model:
-            return self.response_model(**response).dict(
-                include=self.response_model_include,  # type:ignore
-                exclude=self.response_model_exclude,  # type:ignore
-                by_alias=self.response_model_by_alias,
-                exclude_unset=self.response_model_exclude_unset,
-                exclude_defaults=self.response_model_exclude_defaults,
-                exclude_none=self.response_model_exclude_none,
+            converted = self.convert_response_dict(response)
+            if isinstance(converted, BaseModel):
+                return self.render_model(converted, self.response_model_options)
+            return converted
+        return response
+
+    def convert_response_dict(self, response: Dict[str, Any]) -> Union[BaseModel, Dict[str, Any]]:
+        """
+        full: validate the dict with response_model
+        construct: build response_model without validation, only apply include/exclude
+        off: return the dict as it is
+        with response_validation_sample=N, one in N responses is still fully validated
+        """
+        response_model: Type[BaseModel] = self.response_model  # type:ignore
+        if self.response_validation == "full":
+            return response_model(**response)
+        if (
+            self.response_validation_sample
+            and next(self.response_counter) % self.response_validation_sample == 0
+        ):
+            try:
+                return response_model(**response)
+            except ValidationError as e:
+                current_app.logger.error(
+                    "Response of %s failed sampled validation:\n%s", self.path, e
+                )
+        if self.response_validation == "construct":
+            return model_construct(response_model, response)
+        return response
+
+    def render_model(self, model: BaseModel, options: Dict[str, Any]) -> ResponseReturnValue:
+        if self.json_serializer is None:
+            return model_dump(model, **options)
+        return current_app.response_class(
+            self.json_serializer(model, options), mimetype="application/json"
+        )
+
+    def render_item(self, item: Any) -> bytes:
+        if isinstance(item, dict):
+            item = self.convert_response_dict(item)
+        if isinstance(item, BaseModel):
+            if self.json_serializer is not None:
+                return self.json_serializer(item, self.response_model_options)
+            item = model_dump(item, **self.response_model_options)
+        return json.dumps(item).encode()
+
+    def get_list_mimetype(self) -> str:
+        """a json array, or NDJSON if the client accepts application/x-ndjson"""
+        mimetype = request.accept_mimetypes.best_match(
+            ["application/json", "application/x-ndjson"], "application/json"
+        )
+        return mimetype or "application/json"
+
+    def render_list(self, items: List[Any]) -> Any:
+        """validate and serialize all the items before responding, unlike stream_response"""
+        mimetype = self.get_list_mimetype()
+        rendered = [self.render_item(item) for item in items]
+        if mimetype == "application/x-ndjson":
+            data = b"".join(item + b"\n" for item in rendered)
+        else:
+            data = b"[" + b",".join(rendered) + b"]"
+        return current_app.response_class(data, mimetype=mimetype)
+
+    def stream_response(self, items: Iterable[Any]) -> Any:
+        """validate and serialize the items one by one while streaming them"""
+        mimetype = self.get_list_mimetype()
+
+        def generate_ndjson() -> Iterator[bytes]:
+            for item in items:
+                yield self.render_item(item) + b"\n"
+
+        def generate_array() -> Iterator[bytes]:
+            yield b"["
+            for index, item in enumerate(items):
+                if index:
+                    yield b","
+                yield self.render_item(item)
+            yield b"]"
+
+        generate = generate_ndjson if mimetype == "application/x-ndjson" else generate_array
+        return current_app.response_class(stream_with_context(generate()), mimetype=mimetype)
+
+    def make_response(self, rv: ResponseReturnValue) -> Any:
+        resp = make_response(rv)
+        if self.status_code:
+            resp.status_code = self.status_code
+        return resp
+
+    async def run_sync(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        run func in validation_executor if it is set, with the current request context
+        """
+        if self.validation_executor is None:
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self.validation_executor, partial(context.run, func, *args)
+        )
+
+    def join_flight(self, cleaned_data: Dict[str, Any]) -> Tuple[Any, Optional[Flight], Any]:
+        """
+        return the key and the flight if this request leads it,
+        else the response shared by an identical request in flight, if any
+        """
+        if self.single_flight is None or request.method not in ("GET", "HEAD"):
+            return None, None, None
+        key = make_hashable(cleaned_data)
+        if key is None:
+            return None, None, None
+        flight, leader = self.single_flight.join(key)
+        if leader:
+            return key, flight, None
+        shared: Optional[SharedResponse] = flight.wait()
+        if shared is None:
+            return None, None, None
+        response = current_app.response_class(
+            shared.data, status=shared.status, headers=shared.headers
+        )
+        return None, None, response
+
+    def land_flight(
+        self,
+        key: Any,
+        flight: Optional[Flight],
+        response: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """share the response with the followers, a streamed response can only be used once"""
+        if flight is None:
+            return
+        shared = None
+        if response is not None and not response.is_streamed:
+            shared = SharedResponse(
+                response.get_data(), response.status_code, Headers(response.headers)
             )
+        self.single_flight.land(key, flight, shared, error)  # type:ignore
+
+    def lookup_cache(self, cleaned_data: Dict[str, Any]) -> Tuple[Optional[str], Any]:
+        """return the cache key and the cached response, if any"""
+        if self.cache is None or request.method not in ("GET", "HEAD"):
+            return None, None
+        key = self.cache.get_key(self.endpoint_name, cleaned_data)
+        return key, self.cache.load(key)
+
+    def dispatch(self, cleaned_data: Dict[str, Any]) -> Any:
+        response = self.handler(**cleaned_data)
+        rv = self.create_response(response)
+        return self.make_response(rv)
+
+    async def async_dispatch(self, cleaned_data: Dict[str, Any]) -> Any:
+        response = await self.handler(**cleaned_data)
+        rv = await self.run_sync(self.create_response, response)
+        return self.make_response(rv)
+
+    def get_validators(
+        self, cleaned_data: Dict[str, Any]
+    ) -> Tuple[Optional[str], Optional[datetime]]:
+        """return the version and the last modified time given by the view up front"""
+        version = self.etag(**cleaned_data) if callable(self.etag) else None
+        last_modified = self.last_modified(**cleaned_data) if self.last_modified else None
+        return version, last_modified
+
+    def not_modified(
+        self, version: Optional[str], last_modified: Optional[datetime]
+    ) -> Optional[Any]:
+        """return 304 if the request already has the version, without calling view_func"""
+        if (version is None and last_modified is None) or request.method not in ("GET", "HEAD"):
+            return None
+        if is_resource_modified(request.environ, version, last_modified=last_modified):
+            return None
+        response = current_app.response_class(status=304)
+        if version is not None:
+            response.set_etag(version)
+        if last_modified is not None:
+            response.last_modified = last_modified
+        return response
+
+    def tag_response(
+        self, response: Any, version: Optional[str], last_modified: Optional[datetime]
+    ) -> None:
+        """set ETag and Last-Modified, hashing the body if no version was given"""
+        if not 200 <= response.status_code < 300:
+            return
+        if version is not None:
+            response.set_etag(version)
+        elif self.etag and not response.is_streamed:
+            response.add_etag()
+        if last_modified is not None:
+            response.last_modified = last_modified
+
+    async def async_call(self, **kwargs) -> Any:
+        self.compile()
+        cleaned_data, errors = await self.run_sync(self.inject_data, kwargs)
+        if errors:
+            raise RequestValidationError(errors)
+        conditional = self.etag or self.last_modified
+        version, last_modified = self.get_validators(cleaned_data)
+        response = self.not_modified(version, last_modified)
+        if response is not None:
+            return response
+        cache_key, response = self.lookup_cache(cleaned_data)
+        flight_key, flight = None, None
+        if response is None:
+            flight_key, flight, response = self.join_flight(cleaned_data)
+        if response is None:
+            try:
+                response = await self.async_dispatch(cleaned_data)
+            except BaseException as e:
+                self.land_flight(flight_key, flight, error=e)
+                raise
+            if conditional:
+                self.tag_response(response, version, last_modified)
+            self.land_flight(flight_key, flight, response)
+            if cache_key is not None:
+                self.cache.store(cache_key, response)  # type:ignore
+        if conditional:
+            response.make_conditional(request.environ)
         return response
 
     def __call__(self, **kwargs) -> Any:
         if self.view_func is None:
             return self.view_func
+        if self.is_coroutine:
+            return current_app.ensure_sync(self.async_call)(**kwargs)
+        self.compile()
         cleaned_data, errors = self.inject_data(kwargs)
         if errors:
             raise RequestValidationError(errors)
-        response = self.view_func(**cleaned_data)
-        rv = self.create_response(response)
-        resp = make_response(rv)
-        if self.status_code:
-            resp.status_code = self.status_code
-        return resp
+        conditional = self.etag or self.last_modified
+        version, last_modified = self.get_validators(cleaned_data)
+        response = self.not_modified(version, last_modified)
+        if response is not None:
+            return response
+        cache_key, response = self.lookup_cache(cleaned_data)
+        flight_key, flight = None, None
+        if response is None:
+            flight_key, flight, response = self.join_flight(cleaned_data)
+        if response is None:
+            try:
+                response = self.dispatch(cleaned_data)
+            except BaseException as e:
+                self.land_flight(flight_key, flight, error=e)
+                raise
+            if conditional:
+                self.tag_response(response, version, last_modified)
+            self.land_flight(flight_key, flight, response)
+            if cache_key is not None:
+                self.cache.store(cache_key, response)  # type:ignore
+        if conditional:
+            response.make_conditional(request.environ)
+        return response
 
     def __repr__(self):
         return f"View(view_func={self.view_func}, doc_enable={self.doc_enable})"
@@ -0,0 +1,52 @@
+from typing import Any, List, Optional
+
+import pytest
+from pydantic import BaseModel
+
+from flask_sugar import batch
+from flask_sugar.batch import BatchValidator
+from flask_sugar.compat import model_dump, validate_items
+
+
+class Item(BaseModel):
+    id: int
+    price: float
+    name: str
+    active: bool = True
+    note: Optional[str] = None
+
+
+VALID_ITEMS = [
+    {"id": 1, "price": 2, "name": "a"},
+    {"id": "2", "price": 2.5, "name": "b", "active": "false"},
+    {"id": 3, "price": 1e3, "name": "c", "note": "n"},
+]
+INVALID_ITEMS = [
+    {"id": "x", "price": 1, "name": "a"},
+    {"price": None, "name": "b"},
+    {"id": 1.0, "price": 1, "name": 1, "active": "maybe"},
+]
+
+
+def check_batch(items: List[Any]) -> None:
+    models, errors = BatchValidator(Item)(items)
+    expected_models, expected_errors = validate_items(Item, items)
+    assert [model_dump(model) for model in models] == [
+        model_dump(model) for model in expected_models
+    ]
+    assert [set(model_dump(model, exclude_unset=True)) for model in models] == [
+        set(model_dump(model, exclude_unset=True)) for model in expected_models
+    ]
+    assert errors == expected_errors
+
+
+@pytest.mark.parametrize("items", [[], VALID_ITEMS, INVALID_ITEMS, [{"id": i} for i in range(3)]])
+def test_batch_without_numpy(monkeypatch: pytest.MonkeyPatch, items: List[Any]) -> None:
+    monkeypatch.setattr(batch, "numpy", None)
+    check_batch(items)
+
+
+@pytest.mark.parametrize("items", [[], VALID_ITEMS, INVALID_ITEMS, [{"id": i} for i in range(3)]])
+def test_batch_with_numpy(monkeypatch: pytest.MonkeyPatch, items: List[Any]) -> None:
+    monkeypatch.setattr(batch, "numpy", pytest.importorskip("numpy"))
+    check_batch(items)
@@ -0,0 +1,102 @@
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+
+from flask_sugar import Sugar
+from flask_sugar.cache import CacheBackend, ResponseCache
+
+
+class FakeBackend(CacheBackend):
+    """records the calls of ResponseCache in a dict"""
+
+    def __init__(self) -> None:
+        self.entries: Dict[str, Tuple[bytes, Optional[float]]] = {}
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self.entries.get(key)
+        return None if entry is None else entry[0]
+
+    def set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        self.entries[key] = (value, ttl)
+
+    def delete(self, key: str) -> None:
+        self.entries.pop(key, None)
+
+    def clear(self, prefix: str) -> None:
+        for key in [key for key in self.entries if key.startswith(prefix)]:
+            del self.entries[key]
+
+
+@pytest.fixture
+def backend() -> FakeBackend:
+    return FakeBackend()
+
+
+@pytest.fixture
+def app(backend: FakeBackend) -> Sugar:
+    app = Sugar(__name__)
+    calls: List[int] = []
+    app.config["calls"] = calls
+
+    @app.get("/items/<int:item_id>", cache=ResponseCache(ttl=60, backend=backend))
+    def read_item(item_id: int, lang: str = "en"):
+        calls.append(item_id)
+        return {"item_id": item_id, "lang": lang, "calls": len(calls)}
+
+    @app.delete("/items/<int:item_id>")
+    def delete_item(item_id: int):
+        calls.append(-item_id)
+        return {"deleted": item_id}
+
+    return app
+
+
+def test_get_is_cached(app: Sugar, backend: FakeBackend) -> None:
+    client = app.test_client()
+    first = client.get("/items/1?lang=fr")
+    second = client.get("/items/01?lang=fr")
+    assert first.json == second.json == {"item_id": 1, "lang": "fr", "calls": 1}
+    assert second.headers["Content-Type"] == "application/json"
+    assert client.get("/items/1").json["calls"] == 2
+    assert client.head("/items/1").status_code == 200
+    assert app.config["calls"] == [1, 1]
+    assert len(backend.entries) == 2
+    assert {ttl for _, ttl in backend.entries.values()} == {60}
+
+
+def test_other_methods_are_not_cached(app: Sugar) -> None:
+    client = app.test_client()
+    assert client.get("/items/1").json["calls"] == 1
+    assert client.delete("/items/1").json == {"deleted": 1}
+    assert client.delete("/items/1").json == {"deleted": 1}
+    assert app.config["calls"] == [1, -1, -1]
+
+
+def test_invalidate_cache(app: Sugar, backend: FakeBackend) -> None:
+    client = app.test_client()
+    client.get("/items/1")
+    client.get("/items/2")
+    app.invalidate_cache("read_item", item_id=1, lang="en")
+    assert len(backend.entries) == 1
+    assert client.get("/items/1").json["calls"] == 3
+    app.invalidate_cache("read_item")
+    assert backend.entries == {}
+
+
+def test_only_get_and_head_can_be_cached(backend: FakeBackend) -> None:
+    app = Sugar(__name__)
+    with pytest.raises(AssertionError):
+        app.route("/items/", methods=["GET", "DELETE"], cache=ResponseCache(backend=backend))(
+            lambda: {}
+        )
+    with pytest.raises(AssertionError):
+        app.post("/items/", cache=ResponseCache(backend=backend))(lambda: {})
+
+
+def test_backend_must_implement_all_methods() -> None:
+    class IncompleteBackend(CacheBackend):
+        def get(self, key: str) -> Optional[bytes]:
+            return None
+
+    with pytest.raises(TypeError):
+        IncompleteBackend()  # type: ignore
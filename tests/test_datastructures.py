@@ -0,0 +1,41 @@
+import io
+import mmap
+
+import pytest
+
+from flask_sugar import File, Sugar, UploadFile
+
+
+@pytest.fixture
+def app() -> Sugar:
+    app = Sugar(__name__)
+
+    @app.post("/upload")
+    def upload(file: UploadFile = File(..., spool_threshold=4)):
+        mapped = file.mmap()
+        return {"type": type(mapped).__name__, "data": bytes(mapped).decode()}
+
+    return app
+
+
+@pytest.mark.parametrize(
+    "data, mapped_type",
+    [(b"", "memoryview"), (b"abc", "memoryview"), (b"abcdefgh", "mmap")],
+)
+def test_upload_mmap(app: Sugar, data: bytes, mapped_type: str) -> None:
+    response = app.test_client().post("/upload", data={"file": (io.BytesIO(data), "a.txt")})
+    assert response.status_code == 200
+    assert response.json == {"type": mapped_type, "data": data.decode()}
+
+
+def test_mmap_without_fileno() -> None:
+    assert bytes(UploadFile(io.BytesIO(b"xyz"), "x").mmap()) == b"xyz"
+
+
+def test_mmap_empty_file(tmp_path) -> None:
+    path = tmp_path / "empty"
+    path.write_bytes(b"")
+    with path.open("rb") as stream:
+        mapped = UploadFile(stream, "empty").mmap()
+    assert not isinstance(mapped, mmap.mmap)
+    assert bytes(mapped) == b""
@@ -0,0 +1,28 @@
+import io
+
+from flask_sugar import File, Header, Sugar, UploadFile
+from flask_sugar.instrumentation import Instrumentation
+
+
+def test_one_timing_per_phase() -> None:
+    instrumentation = Instrumentation()
+    app = Sugar(__name__, instrumentation=instrumentation)
+
+    @app.post("/upload/<int:folder>")
+    def upload(folder: int, name: str = "", token: str = Header(""), file: UploadFile = File(...)):
+        return {"folder": folder}
+
+    response = app.test_client().post(
+        "/upload/1?name=a", data={"file": (io.BytesIO(b"abc"), "a.txt")}
+    )
+    assert response.json == {"folder": 1}
+    phases = instrumentation.snapshot()["upload"]
+    assert set(phases) == {
+        "extract_params",
+        "validate_params",
+        "extract_files",
+        "validate_files",
+        "handler",
+        "response",
+    }
+    assert all(histogram["count"] == 1 for histogram in phases.values()), phases
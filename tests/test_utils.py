@@ -0,0 +1,70 @@
+from io import BytesIO
+
+import pytest
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from flask_sugar.utils import LimitedInputStream, iter_json_array
+
+
+def parse(data: bytes, chunk_size: int = 64 * 1024) -> list:
+    return list(iter_json_array(BytesIO(data), chunk_size=chunk_size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64 * 1024])
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        (b"[]", []),
+        (b" [ \n ] ", []),
+        (b"[1, 2.5, -3]", [1, 2.5, -3]),
+        (b'[[1, [2]], [], {"a": [3]}]', [[1, [2]], [], {"a": [3]}]),
+        (b'["]", "a]b", "\\"]"]', ["]", "a]b", '"]']),
+        (b'[{"name": "\xc3\xa9]"}, null, true]', [{"name": "é]"}, None, True]),
+        (b"[12345678, 1.5e10]", [12345678, 1.5e10]),
+    ],
+)
+def test_iter_json_array(data: bytes, expected: list, chunk_size: int) -> None:
+    assert parse(data, chunk_size) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 64 * 1024])
+@pytest.mark.parametrize(
+    "data",
+    [b"", b"[", b"[1,", b"[1, 2", b'["a]', b"[[1, 2]", b'[{"a": 1}'],
+)
+def test_iter_json_array_truncated(data: bytes, chunk_size: int) -> None:
+    with pytest.raises(ValueError):
+        parse(data, chunk_size)
+
+
+@pytest.mark.parametrize("data", [b"{}", b"1", b"[1 2]", b"[1,]", b"[,1]"])
+def test_iter_json_array_invalid(data: bytes) -> None:
+    with pytest.raises(ValueError):
+        parse(data)
+
+
+def test_iter_json_array_is_lazy() -> None:
+    items = iter_json_array(BytesIO(b"[1, 2, oops]"), chunk_size=4)
+    assert next(items) == 1
+    assert next(items) == 2
+    with pytest.raises(ValueError):
+        next(items)
+
+
+def test_limited_input_stream() -> None:
+    stream = LimitedInputStream(BytesIO(b"a\nbc"), 4, "too large")
+    assert stream.readline() == b"a\n"
+    assert stream.read(1) == b"b"
+    assert stream.read() == b"c"
+    assert stream.read() == b""
+
+
+@pytest.mark.parametrize(
+    "read", [lambda s: s.read(), lambda s: s.read(100), lambda s: s.readline()]
+)
+def test_limited_input_stream_too_large(read) -> None:
+    source = BytesIO(b"x" * 1000)
+    stream = LimitedInputStream(source, 4, "too large")
+    with pytest.raises(RequestEntityTooLarge):
+        read(stream)
+    assert source.tell() == 5
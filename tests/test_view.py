@@ -0,0 +1,39 @@
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel
+
+from flask_sugar import File, Sugar, UploadFile
+from flask_sugar.view import View
+
+
+class Unsupported:
+    pass
+
+
+class Item(BaseModel):
+    name: str
+
+
+def test_failed_lazy_build_is_retried_from_scratch() -> None:
+    app = Sugar(__name__, lazy_views=True)
+
+    @app.post("/items/<int:item_id>")
+    def create_item(
+        item_id: int,
+        item: Item,
+        file: UploadFile = File(...),
+        q: Optional[str] = None,
+        bad: Unsupported = None,  # type: ignore
+    ):
+        return {}
+
+    view = app.view_functions["create_item"]
+    assert isinstance(view, View)
+    for _ in range(2):
+        with pytest.raises(Exception):
+            view.compile()
+        assert not view.compiled
+        assert [info.name for info in view.parameter_infos] == ["item_id", "q", "bad"]
+        assert [info.name for info in view.file_infos] == ["file"]
+        assert view.body_info is not None and view.body_info.name == "item"